@@ -1,28 +1,39 @@
 #!/usr/bin/env python3
 
 import os
+import stat
+import tempfile
+import time
+import asyncio
 import logging
-from typing import Optional, List
+import weakref
+from typing import Dict, Optional, List, Tuple
 
-import requests
-from dotenv import load_dotenv, set_key
+import httpx
+import orjson
 import base64
+import hashlib
 import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-load_dotenv()
+import envs
 from fastapi import FastAPI, HTTPException, Query, Request, Header, Depends
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from provider_manager import get_provider_manager
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field, field_validator
+from provider_manager import ProviderManager, get_provider_manager
 from session_manager import SessionManager
+from rate_limiter import RateLimiterMiddleware, InMemoryBackend
 
 logging.basicConfig(
-    level=os.getenv('LOG_LEVEL', 'INFO'),
+    level=envs.LOG_LEVEL,
     format='%(asctime)s [%(levelname)s] %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
+# httpx logs every request at INFO; keep upstream calls out of the gateway log
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 app = FastAPI(
     title="GoTo API Gateway",
@@ -60,14 +71,201 @@ to the GoTo Admin and Voice API with automatic token refresh.
         "name": "MIT"
     }
 )
-pm = get_provider_manager()
-sm = SessionManager(pm.redis_client)
+
+# Token buckets per client IP so one caller can't saturate the upstream
+# connection pool; limits are requests per period in seconds. Only the voice
+# proxy resolves credentials from tenant_id, so only it is bucketed per tenant.
+# Buckets are in-process: with WORKERS=N each worker enforces these limits on
+# its own, so the effective limit is up to N times higher
+RATE_LIMIT_RULES = {
+    "/voice-proxy/": {"limit": 60, "period": 60, "per_tenant": True},
+    "/admin-proxy/": {"limit": 60, "period": 60},
+    "/scim-proxy/": {"limit": 30, "period": 60},
+}
+_rate_limit_backend = InMemoryBackend()
+app.add_middleware(RateLimiterMiddleware, rules=RATE_LIMIT_RULES, backend=_rate_limit_backend)
+
+
+# Upstream transport failures (connect errors, timeouts, protocol errors)
+# surface as 500s here rather than through per-endpoint try/except blocks
+@app.exception_handler(httpx.HTTPError)
+async def upstream_error_handler(request: Request, exc: httpx.HTTPError):
+    logger.error("Upstream request failed: %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
+REDIS_MAX_CONNECTIONS = envs.REDIS_MAX_CONNECTIONS
+# Idle upstream connections stay open this long so bursts skip the TLS handshake
+UPSTREAM_KEEPALIVE_SECONDS = 30.0
+# Per-phase upstream timeouts: dead hosts fail on connect within 3s instead of
+# consuming the whole budget. Writes and proxied calls keep a longer read window.
+UPSTREAM_TIMEOUT = httpx.Timeout(connect=3.0, read=25.0, write=10.0, pool=5.0)
+UPSTREAM_LONG_TIMEOUT = httpx.Timeout(connect=3.0, read=55.0, write=10.0, pool=5.0)
+
+# Created per worker on startup rather than at import, so each forked
+# uvicorn worker gets its own pooled Redis connections
+pm: Optional[ProviderManager] = None
+sm: Optional[SessionManager] = None
+
+
+@app.on_event("startup")
+async def init_managers():
+    global pm, sm
+    pm = get_provider_manager(max_connections=REDIS_MAX_CONNECTIONS)
+    sm = SessionManager(pm.redis_client)
+
+
+@app.on_event("startup")
+async def load_tokens():
+    app.state.tokens = {name: getattr(envs, access_env) for name, (access_env, _) in _TOKEN_ENV.items()}
+
+
+@app.on_event("shutdown")
+async def close_managers():
+    if pm is not None:
+        pm.redis_client.connection_pool.disconnect()
+
+
+@app.on_event("startup")
+async def open_http_clients():
+    # One pooled client per worker for all upstream GoTo API calls, plus a
+    # dedicated OAuth client that retries transient connection failures.
+    # HTTP/2 multiplexes concurrent requests over a few TLS connections.
+    app.state.http = httpx.AsyncClient(
+        timeout=UPSTREAM_TIMEOUT,
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=2,
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=20,
+                keepalive_expiry=UPSTREAM_KEEPALIVE_SECONDS,
+            ),
+        ),
+    )
+    app.state.oauth_http = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(retries=2),
+        timeout=UPSTREAM_TIMEOUT,
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await app.state.http.aclose()
+    await app.state.oauth_http.aclose()
 
 ADMIN_BASE_URL = "https://api.getgo.com/admin/rest/v1"
 VOICE_BASE_URL = "https://api.jive.com/voice-admin/v1"
 SCIM_BASE_URL = "https://api.getgo.com/identity/v1"
+
+# Fixed upstream URLs, joined once at import
+_CALL_QUEUES_URL = f"{VOICE_BASE_URL}/call-queues"
+_EXTENSIONS_URL = f"{VOICE_BASE_URL}/extensions"
+_AUTOATT_LIST_URL = f"{VOICE_BASE_URL}/autoattendants"
+_AUTOATT_ITEM_URL_PREFIX = f"{VOICE_BASE_URL}/autoattendants/"
+_ADMIN_ME_URL = f"{ADMIN_BASE_URL}/me"
+
 DEFAULT_ACCOUNT_KEY = "4266846632996939781"
 DEFAULT_TENANT_ID = "cloudwarriors"
+# Static upstream headers; requests add only the bearer token (httpx accepts header tuples)
+_BASE_HEADERS = (("Accept", "application/json"), ("Content-Type", "application/json"))
+TOKEN_URL = "https://identity.goto.com/oauth/token"
+
+# OAuth client settings are read once at import
+_CLIENT_ID = envs.CLIENT_ID
+_CLIENT_SECRET = envs.CLIENT_SECRET
+_REDIRECT_URI = envs.REDIRECT_URI or "http://localhost:9111"
+
+
+# Client credentials never change between calls, so the encoded Basic
+# header is built once per (client_id, client_secret)
+@lru_cache(maxsize=64)
+def _basic_auth(client_id: str, client_secret: str) -> str:
+    return "Basic " + base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+
+
+# Env-backed (access, refresh) token variables per token type. Access tokens
+# are loaded into app.state.tokens at startup and updated in place by
+# exchange_code_for_token when new tokens are stored
+_TOKEN_ENV = {
+    "admin": ("ACCESS_TOKEN", "REFRESH_TOKEN"),
+    "voice": ("VOICE_ACCESS_TOKEN", "VOICE_REFRESH_TOKEN"),
+    "scim": ("SCIM_ACCESS_TOKEN", "SCIM_REFRESH_TOKEN"),
+}
+# Granted scope marker -> token type; tokens matching none are admin tokens
+_SCOPE_TOKEN_TYPES = (("voice-admin", "voice"), ("identity:scim.org", "scim"))
+
+# Skip refreshes for 5 minutes after a success; back off 1 minute after invalid_grant
+REFRESH_COOLDOWN_SECONDS = 300
+REFRESH_FAILURE_BACKOFF_SECONDS = 60
+# Refreshed tokens keep their real token_expiry but get a refresh_at deadline
+# after this share of their lifetime (at least 30s), so rotation happens well
+# before the real expiry
+ROTATE_FRACTION = 0.8
+
+_last_refresh_ok: Dict[str, float] = {}
+_last_refresh_fail: Dict[str, float] = {}
+# Per-tenant locks live only while a caller holds or waits on them, so
+# requests for arbitrary tenant_ids can't grow these maps without bound
+_refresh_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# GoTo token + provider record per tenant, reused across proxy requests for up
+# to 55 minutes (access tokens live 60) and never past the token's refresh deadline;
+# an upstream 401 or a manual refresh drops the entry early
+CREDENTIALS_CACHE_SECONDS = 55 * 60
+_token_cache: Dict[str, Tuple[str, float]] = {}
+_provider_cache: Dict[Tuple[str, str], Tuple[dict, float]] = {}
+_credentials_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+# DIAL_PLAN extensions per accountKey indexed by id, so single auto attendant
+# lookups don't pull the whole /extensions list on every call
+AUTO_ATTENDANT_CACHE_SECONDS = 30
+_ext_cache: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+
+# Load-balancer probes hit /health every few seconds; serve them from memory
+HEALTH_CACHE_SECONDS = envs.HEALTH_CACHE_SECONDS
+HEALTH_CACHE_MAX_TENANTS = 256
+_health_cache: Dict[str, tuple] = {}
+
+# Short-lived copies of idempotent GET passthroughs (/call-queues, /me),
+# keyed by (route, tenant, accountKey)
+MICROCACHE_SECONDS = envs.MICROCACHE_SECONDS
+MICROCACHE_MAX_ENTRIES = 1024
+_microcache: Dict[tuple, tuple] = {}
+
+# Upstream fetches currently in flight, keyed like _microcache, so concurrent
+# identical GETs share one upstream call
+_inflight: Dict[tuple, asyncio.Task] = {}
+
+# Upper bound on sub-requests accepted by /voice-proxy/_batch; each one is
+# charged against the /voice-proxy/ rate limit, so keep it within that limit
+BATCH_MAX_REQUESTS = 50
+
+PROXY_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH"]
+
+
+def _microcache_get(key: tuple):
+    cached = _microcache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def _microcache_put(key: tuple, value):
+    if len(_microcache) >= MICROCACHE_MAX_ENTRIES:
+        _microcache.clear()
+    _microcache[key] = (time.monotonic() + MICROCACHE_SECONDS, value)
+
+
+async def _singleflight(key: tuple, fetch):
+    # No await between lookup and insert, so no lock is needed on one loop.
+    # Waiters are shielded so one client disconnecting doesn't cancel the
+    # upstream call for the rest.
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
 
 
 def get_provider_credentials(tenant_id: str, provider: str):
@@ -81,122 +279,226 @@ def get_provider_credentials(tenant_id: str, provider: str):
     return provider_data
 
 
-def get_goto_token(tenant_id: str = DEFAULT_TENANT_ID):
+@lru_cache(maxsize=1024)
+def _expiry_ts(token_expiry: str) -> float:
+    # Stored expiries are ISO 8601 strings; parse each distinct value once and
+    # compare against time.time() instead of building datetimes per request
+    return datetime.fromisoformat(token_expiry.replace('Z', '+00:00')).timestamp()
+
+
+def _refresh_deadline(provider_data) -> Optional[str]:
+    # refresh_at is only set by our own refreshes; tokens written elsewhere
+    # (seed/migrate tools) rotate at their real expiry
+    return provider_data.get('refresh_at') or provider_data.get('token_expiry')
+
+
+async def get_goto_token(tenant_id: str = DEFAULT_TENANT_ID):
     provider_data = get_provider_credentials(tenant_id, 'goto')
     token = provider_data.get('access_token')
-    token_expiry = provider_data.get('token_expiry')
+    refresh_deadline = _refresh_deadline(provider_data)
     
     if not token:
         raise HTTPException(status_code=401, detail="No GoTo access token available")
     
-    if token_expiry:
+    if refresh_deadline:
         try:
-            expiry_dt = datetime.fromisoformat(token_expiry.replace('Z', '+00:00'))
-            now_dt = datetime.now(expiry_dt.tzinfo)
-            
-            if now_dt >= expiry_dt:
-                logger.info(f"Token expired, refreshing for tenant {tenant_id}...")
-                refresh_result = refresh_goto_token(tenant_id)
+            if time.time() >= _expiry_ts(refresh_deadline):
+                logger.info("Token expired, refreshing for tenant %s...", tenant_id)
+                refresh_result = await refresh_goto_token(tenant_id)
                 if refresh_result['success']:
                     provider_data = get_provider_credentials(tenant_id, 'goto')
                     token = provider_data.get('access_token')
                 else:
                     raise HTTPException(status_code=401, detail="Token refresh failed")
         except Exception as e:
-            logger.warning(f"Token expiry check failed: {e}")
+            logger.warning("Token expiry check failed: %s", e)
     
     return token
 
 
-def refresh_goto_token(tenant_id: str):
+def _tenant_lock(locks: weakref.WeakValueDictionary, tenant_id: str) -> asyncio.Lock:
+    lock = locks.get(tenant_id)
+    if lock is None:
+        lock = locks[tenant_id] = asyncio.Lock()
+    return lock
+
+
+def _get_cached_credentials(tenant_id: str):
+    now = time.monotonic()
+    cached_token = _token_cache.get(tenant_id)
+    cached_provider = _provider_cache.get((tenant_id, 'goto'))
+    if cached_token and cached_provider and cached_token[1] > now and cached_provider[1] > now:
+        return cached_token[0], cached_provider[0]
+    return None
+
+
+async def get_goto_credentials(tenant_id: str) -> Tuple[str, dict]:
+    cached = _get_cached_credentials(tenant_id)
+    if cached:
+        return cached
+    
+    # Per tenant, since a miss may wait on a token refresh over the network
+    lock = _tenant_lock(_credentials_locks, tenant_id)
+    async with lock:
+        cached = _get_cached_credentials(tenant_id)
+        if cached:
+            return cached
+        
+        token = await get_goto_token(tenant_id)
+        provider_data = get_provider_credentials(tenant_id, 'goto')
+        ttl = CREDENTIALS_CACHE_SECONDS
+        refresh_deadline = _refresh_deadline(provider_data)
+        if refresh_deadline:
+            try:
+                ttl = min(ttl, _expiry_ts(refresh_deadline) - time.time())
+            except ValueError:
+                pass
+        if ttl > 0:
+            expires = time.monotonic() + ttl
+            _token_cache[tenant_id] = (token, expires)
+            _provider_cache[(tenant_id, 'goto')] = (provider_data, expires)
+        return token, provider_data
+
+
+def invalidate_goto_credentials(tenant_id: str):
+    _token_cache.pop(tenant_id, None)
+    _provider_cache.pop((tenant_id, 'goto'), None)
+
+
+def _is_token_valid(provider_data) -> bool:
+    token_expiry = provider_data.get('token_expiry')
+    if not provider_data.get('access_token') or not token_expiry:
+        return False
+    try:
+        return time.time() < _expiry_ts(token_expiry)
+    except ValueError:
+        return False
+
+
+async def refresh_goto_token(tenant_id: str):
+    # One refresh per tenant at a time; callers that queued behind it re-read
+    # the provider record and hit the post-refresh cooldown instead of
+    # spending (and invalidating) the refresh token again
+    lock = _tenant_lock(_refresh_locks, tenant_id)
+    async with lock:
+        return await _refresh_goto_token(tenant_id)
+
+
+async def _refresh_goto_token(tenant_id: str):
     try:
+        now = time.time()
+        if now - _last_refresh_fail.get(tenant_id, 0.0) < REFRESH_FAILURE_BACKOFF_SECONDS:
+            return {"success": False, "error": "Refresh token was rejected recently, retry later"}
+        
         provider_data = pm.get_provider(tenant_id, 'goto')
         if not provider_data:
             return {"success": False, "error": "Provider not found"}
         
-        token_url = 'https://identity.goto.com/oauth/token'
+        if now - _last_refresh_ok.get(tenant_id, 0.0) < REFRESH_COOLDOWN_SECONDS and _is_token_valid(provider_data):
+            return {"success": True, "expires_at": provider_data.get('token_expiry')}
+        
         token_data = {
             'grant_type': 'refresh_token',
             'refresh_token': provider_data['refresh_token'],
         }
         
-        auth_string = base64.b64encode(f"{provider_data['client_id']}:{provider_data['client_secret']}".encode()).decode()
         headers = {
-            'Authorization': f'Basic {auth_string}',
+            'Authorization': _basic_auth(provider_data['client_id'], provider_data['client_secret']),
             'Content-Type': 'application/x-www-form-urlencoded'
         }
         
-        response = requests.post(token_url, data=token_data, headers=headers)
+        response = await app.state.oauth_http.post(TOKEN_URL, data=token_data, headers=headers)
         
         if response.status_code == 200:
-            token_response = response.json()
+            token_response = orjson.loads(response.content)
             access_token = token_response['access_token']
             new_refresh_token = token_response.get('refresh_token', provider_data['refresh_token'])
             expires_in = token_response.get('expires_in', 3600)
-            expires_at = (datetime.now() + timedelta(seconds=expires_in)).isoformat() + 'Z'
+            now_dt = datetime.utcnow()
+            expires_at = (now_dt + timedelta(seconds=expires_in)).isoformat() + 'Z'
+            rotate_in = max(30, int(expires_in * ROTATE_FRACTION))
+            refresh_at = (now_dt + timedelta(seconds=rotate_in)).isoformat() + 'Z'
             
-            pm.update_tokens(tenant_id, 'goto', access_token, new_refresh_token, expires_at)
+            pm.update_tokens(tenant_id, 'goto', access_token, new_refresh_token, expires_at, refresh_at=refresh_at)
+            _last_refresh_ok[tenant_id] = time.time()
             
-            logger.info(f"Token refreshed successfully for tenant {tenant_id}")
+            logger.info("Token refreshed successfully for tenant %s", tenant_id)
             return {"success": True, "expires_in": expires_in, "expires_at": expires_at}
         else:
+            if response.status_code == 400 and 'invalid_grant' in response.text:
+                _last_refresh_fail[tenant_id] = time.time()
             return {"success": False, "error": response.text}
             
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-def exchange_code_for_token(code):
-    client_id = os.getenv('CLIENT_ID')
-    client_secret = os.getenv('CLIENT_SECRET')
-    redirect_uri = os.getenv('REDIRECT_URI', 'http://localhost:9111')
+def _update_env(pairs: Dict[str, str], path: str = ".env"):
+    # Rewrite .env once for all keys (set_key re-reads and rewrites the file
+    # per key), replacing it atomically so readers never see a partial file
+    os.environ.update(pairs)
     
-    token_url = "https://identity.goto.com/oauth/token"
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        lines = []
+    
+    pending = dict(pairs)
+    for i, line in enumerate(lines):
+        name = line.split("=", 1)[0].strip()
+        key = name[7:].strip() if name.startswith("export ") else name
+        if "=" in line and key in pending:
+            lines[i] = f"{name}='{pending.pop(key)}'"
+    lines.extend(f"{key}='{value}'" for key, value in pending.items())
     
+    # mkstemp gives a unique 0600 file next to .env; keep the existing file's
+    # mode so the rewrite never widens access to the secrets
+    fd, tmp_path = tempfile.mkstemp(prefix=".env.", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+async def exchange_code_for_token(code):
     token_data = {
         'grant_type': 'authorization_code',
         'code': code,
-        'redirect_uri': redirect_uri
+        'redirect_uri': _REDIRECT_URI
     }
     
-    auth_string = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
     headers = {
-        'Authorization': f'Basic {auth_string}',
+        'Authorization': _basic_auth(_CLIENT_ID, _CLIENT_SECRET),
         'Content-Type': 'application/x-www-form-urlencoded'
     }
     
     try:
-        response = requests.post(token_url, data=token_data, headers=headers)
+        response = await app.state.oauth_http.post(TOKEN_URL, data=token_data, headers=headers)
         
         if response.status_code == 200:
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             access_token = token_data.get('access_token')
             refresh_token = token_data.get('refresh_token')
             expires_in = token_data.get('expires_in', 3600)
             scope = token_data.get('scope', '')
             
-            # Set based on scope
-            if 'voice-admin' in scope:
-                os.environ['VOICE_ACCESS_TOKEN'] = access_token
-                set_key('.env', 'VOICE_ACCESS_TOKEN', access_token)
-                if refresh_token:
-                    os.environ['VOICE_REFRESH_TOKEN'] = refresh_token
-                    set_key('.env', 'VOICE_REFRESH_TOKEN', refresh_token)
-            
-            if 'identity:scim.org' in scope:
-                os.environ['SCIM_ACCESS_TOKEN'] = access_token
-                set_key('.env', 'SCIM_ACCESS_TOKEN', access_token)
+            token_types = [name for marker, name in _SCOPE_TOKEN_TYPES if marker in scope] or ["admin"]
+            env_updates = {}
+            for token_type in token_types:
+                access_env, refresh_env = _TOKEN_ENV[token_type]
+                env_updates[access_env] = access_token
+                app.state.tokens[token_type] = access_token
                 if refresh_token:
-                    os.environ['SCIM_REFRESH_TOKEN'] = refresh_token
-                    set_key('.env', 'SCIM_REFRESH_TOKEN', refresh_token)
-            
-            # Default to admin if no specific scope
-            if not ('voice-admin' in scope or 'identity:scim.org' in scope):
-                os.environ['ACCESS_TOKEN'] = access_token
-                set_key('.env', 'ACCESS_TOKEN', access_token)
-                if refresh_token:
-                    os.environ['REFRESH_TOKEN'] = refresh_token
-                    set_key('.env', 'REFRESH_TOKEN', refresh_token)
+                    env_updates[refresh_env] = refresh_token
+            _update_env(env_updates)
             
             return {
                 'success': True,
@@ -241,6 +543,25 @@ class ConnectRequest(BaseModel):
         }
 
 
+class BatchItem(BaseModel):
+    method: str = Field("GET", description="HTTP method for the sub-request")
+    path: str = Field(..., min_length=1, description="Voice Admin API path, e.g. extensions")
+    params: Dict[str, str] = Field(default_factory=dict, description="Query parameters")
+    body: Optional[dict] = Field(None, description="JSON body for POST/PUT/PATCH")
+
+    @field_validator("method")
+    @classmethod
+    def _known_method(cls, value: str) -> str:
+        method = value.upper()
+        if method not in PROXY_METHODS:
+            raise ValueError(f"method must be one of {', '.join(PROXY_METHODS)}")
+        return method
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(..., min_length=1, max_length=BATCH_MAX_REQUESTS)
+
+
 class ConnectResponseData(BaseModel):
     session_id: str = Field(..., description="UUID of created session")
     tenant: str = Field(..., description="Tenant identifier")
@@ -384,6 +705,40 @@ async def extract_session_headers(
     )
 
 
+_default_openapi = app.openapi
+
+
+def _openapi_with_connect_request():
+    # auth_connect validates its body by hand, so ConnectRequest is only
+    # referenced through openapi_extra and must be registered explicitly
+    schema = _default_openapi()
+    schemas = schema.setdefault("components", {}).setdefault("schemas", {})
+    schemas.setdefault("ConnectRequest", ConnectRequest.model_json_schema())
+    return schema
+
+
+app.openapi = _openapi_with_connect_request
+
+
+@lru_cache(maxsize=1)
+def _openapi_document() -> Tuple[bytes, str]:
+    # Routes are fixed once the app is serving, so serialize and hash once
+    body = orjson.dumps(app.openapi())
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+async def openapi_json(request: Request):
+    body, etag = _openapi_document()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+# Replace FastAPI's built-in spec route with one that supports conditional GETs
+app.router.routes = [r for r in app.router.routes if getattr(r, "path", None) != app.openapi_url]
+app.add_api_route(app.openapi_url, openapi_json, include_in_schema=False)
+
+
 # @app.on_event("startup")
 # async def startup_event():
 #     print("🚀 FastAPI starting — initializing headless browser...")
@@ -439,26 +794,38 @@ async def extract_session_headers(
 @app.get("/")
 async def root(code: str = Query(None), state: str = Query(None)):
     if code:
-        logger.info(f"Authorization code received: {code[:10]}...")
-        result = exchange_code_for_token(code)
+        logger.info("Authorization code received: %s...", code[:10])
+        result = await exchange_code_for_token(code)
         if result.get("success"):
             logger.info("Tokens exchanged and stored successfully")
             return {"message": "Tokens exchanged successfully", "token_info": result}
         else:
-            logger.error(f"Token exchange failed: {result.get('error')}")
+            logger.error("Token exchange failed: %s", result.get('error'))
             return {"message": "Token exchange failed", "error": result.get("error")}
     return {"message": "GoTo API Gateway"}
 
 
 @app.get("/health", tags=["Health"])
 async def health(tenant_id: str = Query(DEFAULT_TENANT_ID)):
+    cached = _health_cache.get(tenant_id)
+    if cached and time.monotonic() - cached[0] < HEALTH_CACHE_SECONDS:
+        return cached[1]
+    
+    result = _check_health(tenant_id)
+    if len(_health_cache) >= HEALTH_CACHE_MAX_TENANTS:
+        _health_cache.clear()
+    _health_cache[tenant_id] = (time.monotonic(), result)
+    return result
+
+
+def _check_health(tenant_id: str):
     try:
         redis_healthy = False
         try:
             pm.redis_client.ping()
             redis_healthy = True
         except Exception as redis_err:
-            logger.error(f"Redis health check failed: {redis_err}")
+            logger.error("Redis health check failed: %s", redis_err)
         
         providers = pm.get_all_providers(tenant_id)
         provider_status = {}
@@ -480,7 +847,7 @@ async def health(tenant_id: str = Query(DEFAULT_TENANT_ID)):
             "account_key": DEFAULT_ACCOUNT_KEY,
         }
     except Exception as e:
-        logger.error(f"Health check error: {e}")
+        logger.error("Health check error: %s", e)
         return {
             "status": "healthy",
             "tenant_id": tenant_id,
@@ -499,9 +866,17 @@ async def health(tenant_id: str = Query(DEFAULT_TENANT_ID)):
         404: {"description": "System credentials or provider tokens not found"},
         500: {"description": "Internal server error"}
     },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"$ref": "#/components/schemas/ConnectRequest"}}
+            },
+        }
+    },
     tags=["Authentication"]
 )
-async def auth_connect(body: ConnectRequest):
+async def auth_connect(request: Request):
     """
     Issue a session for tenant/app using pre-seeded credentials in Redis.
     
@@ -509,20 +884,31 @@ async def auth_connect(body: ConnectRequest):
     and provider tokens for use by the Django API Gateway.
     """
     try:
-        system_creds = pm.get_system_credentials(body.tenant, body.app)
+        payload = orjson.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be valid JSON")
+    
+    tenant = payload.get("tenant") if isinstance(payload, dict) else None
+    app_name = payload.get("app") if isinstance(payload, dict) else None
+    if not (isinstance(tenant, str) and isinstance(app_name, str)
+            and 1 <= len(tenant) <= 100 and 1 <= len(app_name) <= 100):
+        raise HTTPException(status_code=400, detail="invalid tenant/app")
+    
+    try:
+        system_creds = pm.get_system_credentials(tenant, app_name)
         if not system_creds:
-            logger.warning(f"System credentials not found: tenant={body.tenant} app={body.app}")
+            logger.warning("System credentials not found: tenant=%s app=%s", tenant, app_name)
             raise HTTPException(
                 status_code=404,
-                detail=f"System credentials not found for tenant={body.tenant} app={body.app}"
+                detail=f"System credentials not found for tenant={tenant} app={app_name}"
             )
         
-        provider_data = pm.get_provider(body.tenant, 'goto')
+        provider_data = pm.get_provider(tenant, 'goto')
         if not provider_data:
-            logger.warning(f"Provider 'goto' not found for tenant={body.tenant}")
+            logger.warning("Provider 'goto' not found for tenant=%s", tenant)
             raise HTTPException(
                 status_code=404,
-                detail=f"Provider 'goto' not found for tenant={body.tenant}"
+                detail=f"Provider 'goto' not found for tenant={tenant}"
             )
         
         provider_tokens = {
@@ -534,20 +920,20 @@ async def auth_connect(body: ConnectRequest):
         }
         
         session_data = sm.create_session(
-            tenant=body.tenant,
-            app=body.app,
+            tenant=tenant,
+            app=app_name,
             system_creds=system_creds,
             provider_tokens=provider_tokens
         )
         
-        logger.info(f"Session created: {session_data['session_id']} for tenant={body.tenant} app={body.app}")
+        logger.info("Session created: %s for tenant=%s app=%s", session_data['session_id'], tenant, app_name)
         
         return ConnectResponse(
             success=True,
             data=ConnectResponseData(
                 session_id=session_data['session_id'],
-                tenant=body.tenant,
-                app=body.app,
+                tenant=tenant,
+                app=app_name,
                 expires_in=300
             ),
             message="GoTo session created successfully"
@@ -555,7 +941,7 @@ async def auth_connect(body: ConnectRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Session creation error: {e}")
+        logger.error("Session creation error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -582,13 +968,13 @@ async def auth_disconnect(session_id: str = Query(..., description="Session UUID
         deleted = sm.delete_session(session_id)
         
         if deleted:
-            logger.info(f"Session disconnected: {session_id}")
+            logger.info("Session disconnected: %s", session_id)
             return DisconnectResponse(
                 success=True,
                 message="Session disconnected successfully"
             )
         else:
-            logger.warning(f"Session not found: {session_id}")
+            logger.warning("Session not found: %s", session_id)
             raise HTTPException(
                 status_code=404,
                 detail=f"Session not found: {session_id}"
@@ -596,7 +982,7 @@ async def auth_disconnect(session_id: str = Query(..., description="Session UUID
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Session disconnect error: {e}")
+        logger.error("Session disconnect error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -625,21 +1011,21 @@ async def auth_status(
             session_data = sm.get_session(session_id)
             
             if not session_data:
-                logger.warning(f"Invalid session: {session_id}")
+                logger.warning("Invalid session: %s", session_id)
                 raise HTTPException(
                     status_code=401,
                     detail=f"Invalid or expired session: {session_id}"
                 )
             
             tenant = session_data.get('tenant')
-            app = session_data.get('app')
+            app_name = session_data.get('app')
             expires_at = session_data.get('expires_at')
             
             provider_tokens = session_data.get('provider_tokens', {})
             has_access_token = bool(provider_tokens.get('access_token'))
             token_expiry = provider_tokens.get('token_expiry')
             
-            logger.info(f"Session validated: {session_id} tenant={tenant} app={app}")
+            logger.info("Session validated: %s tenant=%s app=%s", session_id, tenant, app_name)
             
             return StatusResponse(
                 success=True,
@@ -648,7 +1034,7 @@ async def auth_status(
                     voice_authenticated=has_access_token,
                     scim_authenticated=False,
                     tenant=tenant,
-                    app=app,
+                    app=app_name,
                     session_id=session_id,
                     expires_at=expires_at,
                     provider_token_expiry=token_expiry
@@ -679,15 +1065,15 @@ async def auth_status(
             return StatusResponse(
                 success=True,
                 data=StatusResponseData(
-                    admin_authenticated=bool(os.getenv("ACCESS_TOKEN")),
-                    voice_authenticated=bool(os.getenv("VOICE_ACCESS_TOKEN")),
-                    scim_authenticated=bool(os.getenv("SCIM_ACCESS_TOKEN"))
+                    admin_authenticated=bool(app.state.tokens.get("admin")),
+                    voice_authenticated=bool(app.state.tokens.get("voice")),
+                    scim_authenticated=bool(app.state.tokens.get("scim"))
                 )
             )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Status check error: {e}")
+        logger.error("Status check error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -866,229 +1252,332 @@ async def auth_status(
 #     return token_result
 
 
+def _upstream_json(r: httpx.Response):
+    # GoTo's edge can answer with an HTML error page; surface that as an HTTP
+    # error carrying the upstream text instead of a JSON decode failure
+    try:
+        return orjson.loads(r.content)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=r.status_code if r.status_code >= 400 else 502, detail=r.text)
+
+
+async def _fetch_call_queues(cache_key: tuple, tenant_id: str, accountKey: Optional[str]):
+    for attempt in range(2):
+        token, provider_data = await get_goto_credentials(tenant_id)
+
+        headers = [("Authorization", f"Bearer {token}"), *_BASE_HEADERS]
+        params = {"accountKey": provider_data.get('account_key', accountKey)}
+        api_base_url = provider_data.get('api_base_url')
+        url = f"{api_base_url}/call-queues" if api_base_url else _CALL_QUEUES_URL
+        r = await app.state.http.get(url, headers=headers, params=params)
+        if r.status_code == 401:
+            invalidate_goto_credentials(tenant_id)
+            _microcache.pop(cache_key, None)
+            if attempt == 0:
+                continue
+            raise HTTPException(status_code=401, detail=r.text)
+        result = _upstream_json(r)
+        if r.status_code == 200:
+            _microcache_put(cache_key, result)
+        return result
+
+
 @app.get("/call-queues")
 async def list_call_queues(
     accountKey: Optional[str] = Query(DEFAULT_ACCOUNT_KEY),
     tenant_id: str = Query(DEFAULT_TENANT_ID)
 ):
-    token = get_goto_token(tenant_id)
-    provider_data = get_provider_credentials(tenant_id, 'goto')
-
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    params = {"accountKey": provider_data.get('account_key', accountKey)}
-    url = f"{provider_data.get('api_base_url', VOICE_BASE_URL)}/call-queues"
-    try:
-        r = requests.get(url, headers=headers, params=params, timeout=30)
-        if r.status_code == 401:
-            raise HTTPException(status_code=401, detail=r.text)
-        return r.json()
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    cache_key = ("call-queues", tenant_id, accountKey)
+    cached = _microcache_get(cache_key)
+    if cached is not None:
+        return cached
+    return await _singleflight(cache_key, lambda: _fetch_call_queues(cache_key, tenant_id, accountKey))
+
+
+async def _fetch_me(cache_key: tuple, token: str):
+    headers = [("Authorization", f"Bearer {token}"), *_BASE_HEADERS]
+    url = _ADMIN_ME_URL
+    r = await app.state.http.get(url, headers=headers)
+    if r.status_code == 401:
+        _microcache.pop(cache_key, None)
+        raise HTTPException(status_code=401, detail=r.text)
+    result = _upstream_json(r)
+    if r.status_code == 200:
+        _microcache_put(cache_key, result)
+    return result
 
 
 @app.get("/me")
 async def get_me():
-    token = os.getenv("ACCESS_TOKEN")
+    token = app.state.tokens.get("admin")
     if not token:
         raise HTTPException(status_code=401, detail="No valid token available")
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    url = f"{ADMIN_BASE_URL}/me"
-    try:
-        r = requests.get(url, headers=headers, timeout=30)
-        if r.status_code == 401:
-            raise HTTPException(status_code=401, detail=r.text)
-        return r.json()
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Keyed by token so an OAuth callback swapping the admin token can't
+    # serve the previous identity from cache
+    cache_key = ("me", None, hashlib.sha256(token.encode()).hexdigest())
+    cached = _microcache_get(cache_key)
+    if cached is not None:
+        return cached
+    return await _singleflight(cache_key, lambda: _fetch_me(cache_key, token))
 
 
 # ===============================
 # Voice Auto Attendants Endpoints
 # ===============================
 
+async def _fetch_auto_attendants(token: str, accountKey: str):
+    headers = [("Authorization", f"Bearer {token}"), *_BASE_HEADERS]
+    # Auto attendants are extensions with type DIAL_PLAN; let upstream filter
+    params = {"accountKey": accountKey, "type": "DIAL_PLAN"}
+    url = _EXTENSIONS_URL
+    r = await app.state.http.get(url, headers=headers, params=params)
+    if r.status_code != 200:
+        try:
+            content = orjson.loads(r.content) if r.content else {}
+        except orjson.JSONDecodeError:
+            content = r.text
+        return None, JSONResponse(content=content, status_code=r.status_code)
+    
+    # Filter locally too, in case upstream ignores the type parameter
+    auto_attendants = {
+        ext.get("id"): ext for ext in _upstream_json(r).get("items") or ()
+        if ext.get("type") == "DIAL_PLAN"
+    }
+    _ext_cache[accountKey] = (time.monotonic() + AUTO_ATTENDANT_CACHE_SECONDS, auto_attendants)
+    return auto_attendants, None
+
+
+async def _get_auto_attendants(token: str, accountKey: str):
+    cached = _ext_cache.get(accountKey)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], None
+    return await _singleflight(("autoattendants", None, accountKey), lambda: _fetch_auto_attendants(token, accountKey))
+
+
 @app.get("/autoattendants")
 async def list_auto_attendants(accountKey: Optional[str] = Query(DEFAULT_ACCOUNT_KEY)):
-    token = os.getenv("VOICE_ACCESS_TOKEN")
+    token = app.state.tokens.get("voice")
     if not token:
         raise HTTPException(status_code=401, detail="No valid voice token available")
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    params = {"accountKey": accountKey}
-    url = f"{VOICE_BASE_URL}/extensions"
-    try:
-        r = requests.get(url, headers=headers, params=params, timeout=30)
-        if r.status_code == 200:
-            data = r.json()
-            # Infer auto attendants as extensions with type "DIAL_PLAN"
-            auto_attendants = [ext for ext in data.get("items", []) if ext.get("type") == "DIAL_PLAN"]
-            return {"items": auto_attendants}
-        return JSONResponse(content=(r.json() if r.text else {}), status_code=r.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    auto_attendants, error_response = await _get_auto_attendants(token, accountKey)
+    if error_response:
+        return error_response
+    return {"items": list(auto_attendants.values())}
 
 
 @app.get("/autoattendants/{attendant_id}")
 async def get_auto_attendant(attendant_id: str, accountKey: Optional[str] = Query(DEFAULT_ACCOUNT_KEY)):
-    token = os.getenv("VOICE_ACCESS_TOKEN")
+    token = app.state.tokens.get("voice")
     if not token:
         raise HTTPException(status_code=401, detail="No valid voice token available")
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    params = {"accountKey": accountKey}
-    url = f"{VOICE_BASE_URL}/extensions"
-    try:
-        r = requests.get(url, headers=headers, params=params, timeout=30)
-        if r.status_code == 200:
-            data = r.json()
-            # Find the extension with matching id and type DIAL_PLAN
-            for ext in data.get("items", []):
-                if ext.get("id") == attendant_id and ext.get("type") == "DIAL_PLAN":
-                    return ext
-            return JSONResponse(content={"error": "Auto attendant not found"}, status_code=404)
-        return JSONResponse(content=(r.json() if r.text else {}), status_code=r.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    auto_attendants, error_response = await _get_auto_attendants(token, accountKey)
+    if error_response:
+        return error_response
+        
+    ext = auto_attendants.get(attendant_id)
+    if ext is None:
+        return JSONResponse(content={"error": "Auto attendant not found"}, status_code=404)
+    return ext
 
 
 @app.post("/autoattendants")
 async def create_auto_attendant(request: Request, accountKey: Optional[str] = Query(DEFAULT_ACCOUNT_KEY)):
-    token = os.getenv("VOICE_ACCESS_TOKEN")
+    token = app.state.tokens.get("voice")
     if not token:
         raise HTTPException(status_code=401, detail="No valid voice token available")
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+    headers = [("Authorization", f"Bearer {token}"), ("Accept", "application/json"),
+               ("Content-Type", request.headers.get("content-type", "application/json"))]
     params = {"accountKey": accountKey}
-    body = None
+    body = await request.body() or b"{}"
+    url = _AUTOATT_LIST_URL
+    r = await app.state.http.post(url, headers=headers, params=params, content=body, timeout=UPSTREAM_LONG_TIMEOUT)
+    _ext_cache.pop(accountKey, None)
+    content = None
     try:
-        body = await request.json()
+        content = orjson.loads(r.content)
     except Exception:
-        body = {}
-    url = f"{VOICE_BASE_URL}/autoattendants"
-    try:
-        r = requests.post(url, headers=headers, params=params, json=body, timeout=60)
-        content = None
-        try:
-            content = r.json()
-        except Exception:
-            content = r.text
-        return JSONResponse(content=content, status_code=r.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        content = r.text
+    return JSONResponse(content=content, status_code=r.status_code)
 
 
 @app.put("/autoattendants/{attendant_id}")
 async def update_auto_attendant(attendant_id: str, request: Request, accountKey: Optional[str] = Query(DEFAULT_ACCOUNT_KEY)):
-    token = os.getenv("VOICE_ACCESS_TOKEN")
+    token = app.state.tokens.get("voice")
     if not token:
         raise HTTPException(status_code=401, detail="No valid voice token available")
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+    headers = [("Authorization", f"Bearer {token}"), ("Accept", "application/json"),
+               ("Content-Type", request.headers.get("content-type", "application/json"))]
     params = {"accountKey": accountKey}
-    body = None
+    body = await request.body() or b"{}"
+    url = _AUTOATT_ITEM_URL_PREFIX + attendant_id
+    r = await app.state.http.put(url, headers=headers, params=params, content=body, timeout=UPSTREAM_LONG_TIMEOUT)
+    _ext_cache.pop(accountKey, None)
+    content = None
     try:
-        body = await request.json()
+        content = orjson.loads(r.content)
     except Exception:
-        body = {}
-    url = f"{VOICE_BASE_URL}/autoattendants/{attendant_id}"
-    try:
-        r = requests.put(url, headers=headers, params=params, json=body, timeout=60)
-        content = None
-        try:
-            content = r.json()
-        except Exception:
-            content = r.text
-        return JSONResponse(content=content, status_code=r.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        content = r.text
+    return JSONResponse(content=content, status_code=r.status_code)
 
 
 @app.delete("/autoattendants/{attendant_id}")
 async def delete_auto_attendant(attendant_id: str, accountKey: Optional[str] = Query(DEFAULT_ACCOUNT_KEY)):
-    token = os.getenv("VOICE_ACCESS_TOKEN")
+    token = app.state.tokens.get("voice")
     if not token:
         raise HTTPException(status_code=401, detail="No valid voice token available")
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+    headers = [("Authorization", f"Bearer {token}"), *_BASE_HEADERS]
     params = {"accountKey": accountKey}
-    url = f"{VOICE_BASE_URL}/autoattendants/{attendant_id}"
+    url = _AUTOATT_ITEM_URL_PREFIX + attendant_id
+    r = await app.state.http.delete(url, headers=headers, params=params)
+    _ext_cache.pop(accountKey, None)
+    content = None
     try:
-        r = requests.delete(url, headers=headers, params=params, timeout=30)
-        content = None
-        try:
-            content = r.json()
-        except Exception:
-            content = r.text
-        return JSONResponse(content=content, status_code=r.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        content = orjson.loads(r.content)
+    except Exception:
+        content = r.text
+    return JSONResponse(content=content, status_code=r.status_code)
 
 
 # ===============================
 # Generic Proxy Endpoints
 # ===============================
 
-@app.api_route("/admin-proxy/{api_path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
-async def admin_proxy(api_path: str, request: Request):
-    token = os.getenv("ACCESS_TOKEN")
-    if not token:
-        raise HTTPException(status_code=401, detail="No valid admin token available")
+async def _send_upstream(method: str, url: str, headers: list, params: dict, content: Optional[bytes]) -> httpx.Response:
+    upstream_request = app.state.http.build_request(
+        method, url, headers=headers, params=params, content=content, timeout=UPSTREAM_LONG_TIMEOUT
+    )
+    return await app.state.http.send(upstream_request, stream=True)
+
+
+def _passthrough_response(resp: httpx.Response) -> StreamingResponse:
+    # Forward the upstream bytes as-is (still encoded) instead of parsing and
+    # re-serializing the JSON body; the stream is closed once it is sent
+    headers = {"content-type": resp.headers.get("content-type", "application/json")}
+    if "content-encoding" in resp.headers:
+        headers["content-encoding"] = resp.headers["content-encoding"]
+    return StreamingResponse(
+        resp.aiter_raw(),
+        status_code=resp.status_code,
+        headers=headers,
+        background=BackgroundTask(resp.aclose),
+    )
 
-    url = f"{ADMIN_BASE_URL}/{api_path}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    params = dict(request.query_params)
 
-    data = None
-    if request.method in {"POST", "PUT", "PATCH"}:
-        try:
-            data = await request.json()
-        except Exception:
-            data = None
+# (route prefix and app.state.tokens key, upstream base URL, label)
+# SCIM uses the token with identity:scim.org scope
+_TOKEN_PROXIES = [
+    ("admin", ADMIN_BASE_URL, "admin"),
+    ("scim", SCIM_BASE_URL, "SCIM"),
+]
+
+
+# Write bodies are forwarded as raw bytes with the caller's Content-Type
+# instead of being parsed and re-serialized
+async def _read_proxy_body(request: Request) -> Optional[bytes]:
+    if request.method not in {"POST", "PUT", "PATCH"}:
+        return None
+    return await request.body() or None
+
+
+def _proxy_headers(token: str, request: Request) -> list:
+    # The response body is passed through still encoded, so upstream may only
+    # compress it in a way the caller said it accepts
+    accept_encoding = ("Accept-Encoding", request.headers.get("accept-encoding", "identity"))
+    content_type = request.headers.get("content-type")
+    if content_type and request.method in {"POST", "PUT", "PATCH"}:
+        return [("Authorization", f"Bearer {token}"), ("Accept", "application/json"),
+                ("Content-Type", content_type), accept_encoding]
+    return [("Authorization", f"Bearer {token}"), *_BASE_HEADERS, accept_encoding]
+
+
+def _make_token_proxy(token_name: str, base_url: str, label: str):
+    # Upstream settings are bound in the closure rather than as default
+    # arguments, which FastAPI would expose as query parameters
+    url_prefix = f"{base_url}/"
+
+    async def proxy(api_path: str, request: Request):
+        token = app.state.tokens.get(token_name)
+        if not token:
+            raise HTTPException(status_code=401, detail=f"No valid {label} token available")
 
+        url = url_prefix + api_path
+        headers = _proxy_headers(token, request)
+        params = {k: v for k, v in request.query_params.multi_items()}
+        data = await _read_proxy_body(request)
+
+        resp = await _send_upstream(request.method, url, headers, params, data)
+        return _passthrough_response(resp)
+
+    return proxy
+
+
+for _name, _base_url, _label in _TOKEN_PROXIES:
+    app.add_api_route(
+        f"/{_name}-proxy/{{api_path:path}}",
+        _make_token_proxy(_name, _base_url, _label),
+        methods=PROXY_METHODS,
+        name=f"{_name}_proxy",
+    )
+
+
+async def _batch_call(url_prefix: str, token: str, account_key: str, item: BatchItem) -> dict:
+    params = {"accountKey": account_key, **item.params}
     try:
-        resp = requests.request(request.method, url, headers=headers, params=params, json=data, timeout=60)
-        content = None
-        try:
-            content = resp.json()
-        except Exception:
-            content = resp.text
-        return JSONResponse(content=content, status_code=resp.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        r = await app.state.http.request(
+            item.method,
+            url_prefix + item.path.lstrip('/'),
+            headers=[("Authorization", f"Bearer {token}"), *_BASE_HEADERS],
+            params=params,
+            json=item.body,
+        )
+    except httpx.HTTPError as e:
+        return {"status": 502, "body": {"detail": str(e)}}
+    try:
+        body = orjson.loads(r.content) if r.content else None
+    except orjson.JSONDecodeError:
+        body = r.text
+    return {"status": r.status_code, "body": body}
+
 
+# Registered ahead of the catch-all voice proxy so "_batch" is not forwarded upstream
+@app.post("/voice-proxy/_batch")
+async def voice_proxy_batch(batch: BatchRequest, request: Request, tenant_id: str = Query(DEFAULT_TENANT_ID)):
+    """
+    Run several Voice Admin API calls in one round-trip.
+
+    Credentials are resolved once for the whole batch and the sub-requests
+    are dispatched concurrently; responses come back in request order.
+    Every sub-request counts against the /voice-proxy/ rate limit.
+    """
+    # The middleware charged the batch as one request; charge the rest of the fan-out
+    extra = len(batch.requests) - 1
+    if extra:
+        rule = RATE_LIMIT_RULES["/voice-proxy/"]
+        allowed, retry_after = _rate_limit_backend.consume(
+            RateLimiterMiddleware.bucket_key(request.scope, "/voice-proxy/", rule),
+            rule["limit"], rule["period"], cost=extra,
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+
+    token, provider_data = await get_goto_credentials(tenant_id)
+    url_prefix = f"{provider_data.get('api_base_url', VOICE_BASE_URL)}/"
+    account_key = provider_data.get('account_key', DEFAULT_ACCOUNT_KEY)
 
-@app.api_route("/voice-proxy/{api_path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
+    responses = await asyncio.gather(
+        *(_batch_call(url_prefix, token, account_key, item) for item in batch.requests)
+    )
+    if any(r["status"] == 401 for r in responses):
+        invalidate_goto_credentials(tenant_id)
+    return {"responses": responses}
+
+
+@app.api_route("/voice-proxy/{api_path:path}", methods=PROXY_METHODS)
 async def voice_proxy(api_path: str, request: Request, tenant_id: str = Query(DEFAULT_TENANT_ID)):
     """
     Proxy endpoint for GoTo Voice Admin API.
@@ -1101,93 +1590,50 @@ async def voice_proxy(api_path: str, request: Request, tenant_id: str = Query(DE
     
     Example: GET /voice-proxy/extensions?session_id=xxx
     """
-    token = get_goto_token(tenant_id)
-    provider_data = get_provider_credentials(tenant_id, 'goto')
+    data = await _read_proxy_body(request)
 
-    url = f"{provider_data.get('api_base_url', VOICE_BASE_URL)}/{api_path}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    params = dict(request.query_params)
-    if "tenant_id" in params:
-        del params["tenant_id"]
-    if "accountKey" not in params:
-        params["accountKey"] = provider_data.get('account_key', DEFAULT_ACCOUNT_KEY)
-
-    data = None
-    if request.method in {"POST", "PUT", "PATCH"}:
-        try:
-            data = await request.json()
-        except Exception:
-            data = None
+    for attempt in range(2):
+        token, provider_data = await get_goto_credentials(tenant_id)
 
-    try:
-        resp = requests.request(request.method, url, headers=headers, params=params, json=data, timeout=60)
-        content = None
-        try:
-            content = resp.json()
-        except Exception:
-            content = resp.text
-        return JSONResponse(content=content, status_code=resp.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        url = f"{provider_data.get('api_base_url', VOICE_BASE_URL)}/{api_path}"
+        headers = _proxy_headers(token, request)
+        params = {k: v for k, v in request.query_params.multi_items() if k != "tenant_id"}
+        params.setdefault("accountKey", provider_data.get('account_key', DEFAULT_ACCOUNT_KEY))
 
+        resp = await _send_upstream(request.method, url, headers, params, data)
+        if resp.status_code == 401:
+            invalidate_goto_credentials(tenant_id)
+            if attempt == 0:
+                await resp.aclose()
+                continue
 
-@app.api_route("/scim-proxy/{api_path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
-async def scim_proxy(api_path: str, request: Request):
-    token = os.getenv("SCIM_ACCESS_TOKEN")  # SCIM uses token with identity:scim.org scope
-    if not token:
-        raise HTTPException(status_code=401, detail="No valid SCIM token available")
-
-    url = f"{SCIM_BASE_URL}/{api_path}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-    params = dict(request.query_params)
-
-    data = None
-    if request.method in {"POST", "PUT", "PATCH"}:
-        try:
-            data = await request.json()
-        except Exception:
-            data = None
-
-    try:
-        resp = requests.request(request.method, url, headers=headers, params=params, json=data, timeout=60)
-        content = None
-        try:
-            content = resp.json()
-        except Exception:
-            content = resp.text
-        return JSONResponse(content=content, status_code=resp.status_code)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return _passthrough_response(resp)
 
 
 @app.get("/tenants/{tenant_id}/providers")
 async def list_tenant_providers(tenant_id: str):
     try:
         providers = pm.get_all_providers(tenant_id)
-        provider_list = []
+        # Look providers up concurrently; gather keeps them in request order
+        provider_records = await asyncio.gather(
+            *[asyncio.to_thread(pm.get_provider, tenant_id, provider) for provider in providers]
+        )
         
-        for provider in providers:
-            provider_data = pm.get_provider(tenant_id, provider)
-            if provider_data:
-                provider_list.append({
-                    "provider": provider,
-                    "status": provider_data.get("status"),
-                    "auth_type": provider_data.get("auth_type"),
-                    "account_key": provider_data.get("account_key"),
-                    "has_token": bool(provider_data.get("access_token")),
-                    "token_expiry": provider_data.get("token_expiry"),
-                    "features_enabled": provider_data.get("features_enabled"),
-                    "created_at": provider_data.get("created_at"),
-                    "updated_at": provider_data.get("updated_at"),
-                })
+        provider_list = [
+            {
+                "provider": provider,
+                "status": provider_data.get("status"),
+                "auth_type": provider_data.get("auth_type"),
+                "account_key": provider_data.get("account_key"),
+                "has_token": bool(provider_data.get("access_token")),
+                "token_expiry": provider_data.get("token_expiry"),
+                "features_enabled": provider_data.get("features_enabled"),
+                "created_at": provider_data.get("created_at"),
+                "updated_at": provider_data.get("updated_at"),
+            }
+            for provider, provider_data in zip(providers, provider_records)
+            if provider_data
+        ]
         
         return {"tenant_id": tenant_id, "providers": provider_list}
     except Exception as e:
@@ -1232,9 +1678,10 @@ async def refresh_provider_token(tenant_id: str, provider: str):
         if provider != 'goto':
             raise HTTPException(status_code=400, detail=f"Token refresh not implemented for provider: {provider}")
         
-        result = refresh_goto_token(tenant_id)
+        result = await refresh_goto_token(tenant_id)
         
         if result['success']:
+            invalidate_goto_credentials(tenant_id)
             return {
                 "success": True,
                 "message": "Token refreshed successfully",
@@ -1252,5 +1699,19 @@ async def refresh_provider_token(tenant_id: str, provider: str):
 
 if __name__ == "__main__":
     import uvicorn
-    print("🟢 Starting GoTo API Gateway (FastAPI) v2.0 on http://localhost:8078")
-    uvicorn.run("app:app", host="0.0.0.0", port=8078, reload=True)
+    # One worker by default: app.state.tokens (updated by the OAuth callback),
+    # rate-limit buckets and caches are per process, so extra workers would
+    # keep serving stale tokens. WORKERS opts in once that is acceptable;
+    # APP_ENV=dev keeps a single auto-reloading worker
+    dev = envs.APP_ENV == "dev"
+    workers = 1 if dev else envs.WORKERS or 1
+    print(f"🟢 Starting GoTo API Gateway (FastAPI) v2.0 on http://localhost:8078 ({workers} workers)")
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8078,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        reload=dev,
+    )
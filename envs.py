@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Process configuration read once from the environment (and .env) at import."""
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _get(name: str, default: Optional[str] = None) -> Optional[str]:
+    # Values copied from shell exports or .env files sometimes keep their quotes
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    value = value.strip().strip("'\"")
+    return value or default
+
+
+LOG_LEVEL = _get("LOG_LEVEL", "INFO")
+APP_ENV = _get("APP_ENV")
+WORKERS = int(_get("WORKERS", "0")) or None
+
+REDIS_HOST = _get("REDIS_HOST", "localhost")
+REDIS_PORT = int(_get("REDIS_PORT", "6379"))
+REDIS_DB = int(_get("REDIS_DB", "0"))
+REDIS_MAX_CONNECTIONS = int(_get("REDIS_MAX_CONNECTIONS", "50"))
+
+CLIENT_ID = _get("CLIENT_ID")
+CLIENT_SECRET = _get("CLIENT_SECRET")
+REDIRECT_URI = _get("REDIRECT_URI")
+
+# Startup values only; tokens obtained at runtime are tracked in app.state.tokens
+ACCESS_TOKEN = _get("ACCESS_TOKEN")
+VOICE_ACCESS_TOKEN = _get("VOICE_ACCESS_TOKEN")
+SCIM_ACCESS_TOKEN = _get("SCIM_ACCESS_TOKEN")
+
+HEALTH_CACHE_SECONDS = float(_get("HEALTH_CACHE_SECONDS", "2"))
+MICROCACHE_SECONDS = float(_get("MICROCACHE_SECONDS", "10"))
@@ -1,27 +1,37 @@
 #!/usr/bin/env python3
 
 import redis
-import json
-import os
+import orjson
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from dotenv import load_dotenv
 
-load_dotenv()
+import envs
 
 
 class ProviderManager:
-    def __init__(self, redis_host='localhost', redis_port=6379, redis_db=0):
-        self.redis_client = redis.Redis(
-            host=redis_host,
-            port=redis_port,
-            db=redis_db,
-            decode_responses=True
-        )
+    def __init__(self, redis_host='localhost', redis_port=6379, redis_db=0, redis_pool=None):
+        if redis_pool is not None:
+            self.redis_client = redis.Redis(connection_pool=redis_pool)
+        else:
+            self.redis_client = redis.Redis(
+                host=redis_host,
+                port=redis_port,
+                db=redis_db,
+                decode_responses=True
+            )
+    
+    def pipeline(self, transaction: bool = False):
+        return self.redis_client.pipeline(transaction=transaction)
     
     def get_tenant_key(self, tenant_id: str) -> str:
         return f"tenant:{tenant_id}"
     
+    def get_tenant_config_key(self, tenant_id: str) -> str:
+        return f"tenant:{tenant_id}:config"
+    
+    def get_tenants_set_key(self) -> str:
+        return "tenants:known"
+    
     def get_provider_key(self, tenant_id: str, provider: str) -> str:
         return f"tenant:{tenant_id}:provider:{provider}"
     
@@ -38,7 +48,8 @@ class ProviderManager:
         self,
         tenant_id: str,
         provider: str,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        pipe=None
     ) -> bool:
         provider_key = self.get_provider_key(tenant_id, provider)
         providers_set_key = self.get_providers_set_key(tenant_id)
@@ -53,18 +64,19 @@ class ProviderManager:
             'access_token': str(config.get('access_token', '')),
             'refresh_token': str(config.get('refresh_token', '')),
             'token_expiry': str(config.get('token_expiry', '')),
-            'scopes': json.dumps(config.get('scopes', [])),
+            'scopes': orjson.dumps(config.get('scopes', [])),
             'api_base_url': str(config.get('api_base_url', '')),
             'webhook_url': str(config.get('webhook_url', '')),
-            'features_enabled': json.dumps(config.get('features_enabled', [])),
+            'features_enabled': orjson.dumps(config.get('features_enabled', [])),
             'sync_enabled': str(config.get('sync_enabled', True)),
             'last_sync': str(config.get('last_sync', '')),
             'created_at': datetime.utcnow().isoformat() + 'Z',
             'updated_at': datetime.utcnow().isoformat() + 'Z',
         }
         
-        self.redis_client.hset(provider_key, mapping=provider_data)
-        self.redis_client.sadd(providers_set_key, provider)
+        client = pipe if pipe is not None else self.redis_client
+        client.hset(provider_key, mapping=provider_data)
+        client.sadd(providers_set_key, provider)
         
         return True
     
@@ -75,8 +87,8 @@ class ProviderManager:
         if not data:
             return None
         
-        data['scopes'] = json.loads(data.get('scopes', '[]'))
-        data['features_enabled'] = json.loads(data.get('features_enabled', '[]'))
+        data['scopes'] = orjson.loads(data.get('scopes', '[]'))
+        data['features_enabled'] = orjson.loads(data.get('features_enabled', '[]'))
         data['sync_enabled'] = data.get('sync_enabled', 'True') == 'True'
         
         return data
@@ -89,17 +101,19 @@ class ProviderManager:
         self,
         tenant_id: str,
         provider: str,
-        updates: Dict[str, Any]
+        updates: Dict[str, Any],
+        pipe=None
     ) -> bool:
         provider_key = self.get_provider_key(tenant_id, provider)
         
-        if not self.redis_client.exists(provider_key):
+        # Queued updates can't probe first; the caller has checked existence
+        if pipe is None and not self.redis_client.exists(provider_key):
             return False
         
         update_data = {}
         for key, value in updates.items():
             if key in ['scopes', 'features_enabled']:
-                update_data[key] = json.dumps(value)
+                update_data[key] = orjson.dumps(value)
             elif key == 'sync_enabled':
                 update_data[key] = str(value)
             else:
@@ -107,7 +121,8 @@ class ProviderManager:
         
         update_data['updated_at'] = datetime.utcnow().isoformat() + 'Z'
         
-        self.redis_client.hset(provider_key, mapping=update_data)
+        client = pipe if pipe is not None else self.redis_client
+        client.hset(provider_key, mapping=update_data)
         return True
     
     def delete_provider(self, tenant_id: str, provider: str) -> bool:
@@ -125,10 +140,15 @@ class ProviderManager:
         provider: str,
         access_token: str,
         refresh_token: Optional[str] = None,
-        expires_at: Optional[str] = None
+        expires_at: Optional[str] = None,
+        pipe=None,
+        refresh_at: Optional[str] = None
     ) -> bool:
+        # refresh_at is always written so a token stored without one doesn't
+        # inherit the previous token's early-rotation deadline
         updates = {
             'access_token': access_token,
+            'refresh_at': refresh_at or '',
             'updated_at': datetime.utcnow().isoformat() + 'Z'
         }
         
@@ -138,7 +158,7 @@ class ProviderManager:
         if expires_at:
             updates['token_expiry'] = expires_at
         
-        return self.update_provider(tenant_id, provider, updates)
+        return self.update_provider(tenant_id, provider, updates, pipe=pipe)
     
     def get_active_providers(self, tenant_id: str) -> List[Dict[str, Any]]:
         providers = self.get_all_providers(tenant_id)
@@ -151,8 +171,8 @@ class ProviderManager:
         
         return active_providers
     
-    def set_tenant_config(self, tenant_id: str, config: Dict[str, Any]) -> bool:
-        tenant_key = f"{self.get_tenant_key(tenant_id)}:config"
+    def set_tenant_config(self, tenant_id: str, config: Dict[str, Any], pipe=None) -> bool:
+        tenant_key = self.get_tenant_config_key(tenant_id)
         
         tenant_data = {
             'name': config.get('name', tenant_id),
@@ -164,11 +184,16 @@ class ProviderManager:
             'updated_at': datetime.utcnow().isoformat() + 'Z',
         }
         
-        self.redis_client.hset(tenant_key, mapping=tenant_data)
+        client = pipe if pipe is not None else self.redis_client
+        client.hset(tenant_key, mapping=tenant_data)
+        client.sadd(self.get_tenants_set_key(), tenant_id)
         return True
     
+    def get_all_tenants(self) -> List[str]:
+        return list(self.redis_client.smembers(self.get_tenants_set_key()))
+    
     def get_tenant_config(self, tenant_id: str) -> Optional[Dict[str, Any]]:
-        tenant_key = f"{self.get_tenant_key(tenant_id)}:config"
+        tenant_key = self.get_tenant_config_key(tenant_id)
         data = self.redis_client.hgetall(tenant_key)
         
         if not data:
@@ -181,7 +206,8 @@ class ProviderManager:
         self,
         tenant_id: str,
         app: str,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        pipe=None
     ) -> bool:
         system_key = self.get_system_key(tenant_id, app)
         systems_set_key = self.get_systems_set_key(tenant_id)
@@ -196,8 +222,9 @@ class ProviderManager:
             'updated_at': datetime.utcnow().isoformat() + 'Z',
         }
         
-        self.redis_client.hset(system_key, mapping=system_data)
-        self.redis_client.sadd(systems_set_key, app)
+        client = pipe if pipe is not None else self.redis_client
+        client.hset(system_key, mapping=system_data)
+        client.sadd(systems_set_key, app)
         
         return True
     
@@ -240,9 +267,26 @@ class ProviderManager:
         return True
 
 
-def get_provider_manager():
-    return ProviderManager(
-        redis_host=os.getenv('REDIS_HOST', 'localhost'),
-        redis_port=int(os.getenv('REDIS_PORT', 6379)),
-        redis_db=int(os.getenv('REDIS_DB', 0))
-    )
+# Tools and the gateway share one blocking pool per process; callers wait up to
+# REDIS_POOL_TIMEOUT seconds for a free connection instead of failing fast
+REDIS_POOL_MAX_CONNECTIONS = 16
+REDIS_POOL_TIMEOUT = 5
+
+_provider_manager: Optional[ProviderManager] = None
+
+
+def get_provider_manager(max_connections: Optional[int] = None) -> ProviderManager:
+    global _provider_manager
+    
+    if _provider_manager is None:
+        redis_pool = redis.BlockingConnectionPool(
+            host=envs.REDIS_HOST,
+            port=envs.REDIS_PORT,
+            db=envs.REDIS_DB,
+            max_connections=max_connections or REDIS_POOL_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            decode_responses=True
+        )
+        _provider_manager = ProviderManager(redis_pool=redis_pool)
+    
+    return _provider_manager
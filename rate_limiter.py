@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.responses import JSONResponse
+
+
+class InMemoryBackend:
+    """
+    Per-process token buckets: each key refills at limit/period tokens per second.
+    Nothing is shared between worker processes, so every worker enforces the
+    limits independently.
+    
+    Buckets are kept in least-recently-used order; past max_keys the stalest
+    one is evicted, so a flood of new keys can't reset everyone else's.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def consume(self, key: str, limit: int, period: float, cost: int = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        rate = limit / period
+        # Popping and reinserting moves the key to the end of insertion order
+        tokens, updated = self._buckets.pop(key, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - updated) * rate)
+
+        if len(self._buckets) >= self.max_keys:
+            del self._buckets[next(iter(self._buckets))]
+
+        if tokens < cost:
+            self._buckets[key] = (tokens, now)
+            return False, (cost - tokens) / rate
+
+        self._buckets[key] = (tokens - cost, now)
+        return True, 0.0
+
+
+class RateLimiterMiddleware:
+    """
+    ASGI middleware applying a token bucket per (path prefix, tenant).
+
+    Requests are keyed by client IP. Rules marked per_tenant (routes that
+    actually resolve credentials from tenant_id) key by the tenant_id query
+    parameter when present instead, so one noisy tenant can't monopolize the
+    upstream connection pool; elsewhere tenant_id is ignored, since a caller
+    could otherwise get a fresh bucket per request by varying it. Paths
+    matching no rule pass through.
+    """
+
+    def __init__(self, app, rules: Dict[str, dict], backend: Optional[InMemoryBackend] = None):
+        self.app = app
+        self.rules = list(rules.items())
+        self.backend = backend or InMemoryBackend()
+
+    def _match(self, path: str):
+        for prefix, rule in self.rules:
+            if path.startswith(prefix):
+                return prefix, rule
+        return None, None
+
+    @staticmethod
+    def bucket_key(scope, prefix: str, rule: dict) -> str:
+        """Bucket a request under rule is charged to (also used by endpoints charging extra)"""
+        if rule.get("per_tenant"):
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            tenant = query.get("tenant_id")
+            if tenant:
+                return f"{prefix}|tenant:{tenant[0]}"
+        client = scope.get("client")
+        return f"{prefix}|ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        prefix, rule = self._match(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = self.backend.consume(
+            self.bucket_key(scope, prefix, rule), rule["limit"], rule["period"]
+        )
+        if not allowed:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import uuid
-import json
+import orjson
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
@@ -28,15 +28,14 @@ class SessionManager:
         session_data = {
             'tenant': tenant,
             'app': app,
-            'system_creds': json.dumps(system_creds),
-            'provider_tokens': json.dumps(provider_tokens),
+            'system_creds': system_creds,
+            'provider_tokens': provider_tokens,
             'created_at': created_at,
             'expires_at': expires_at
         }
         
         session_key = self._get_session_key(session_id)
-        self.redis_client.hset(session_key, mapping=session_data)
-        self.redis_client.expire(session_key, self.session_ttl)
+        self.redis_client.set(session_key, orjson.dumps(session_data), ex=self.session_ttl)
         
         return {
             'session_id': session_id,
@@ -49,15 +48,12 @@ class SessionManager:
     
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         session_key = self._get_session_key(session_id)
-        data = self.redis_client.hgetall(session_key)
+        raw = self.redis_client.get(session_key)
         
-        if not data:
+        if not raw:
             return None
         
-        data['system_creds'] = json.loads(data.get('system_creds', '{}'))
-        data['provider_tokens'] = json.loads(data.get('provider_tokens', '{}'))
-        
-        return data
+        return orjson.loads(raw)
     
     def validate_session(self, session_id: str) -> bool:
         session_key = self._get_session_key(session_id)
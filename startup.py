@@ -1,28 +1,34 @@
 #!/usr/bin/env python3
 
-import os
 import sys
 import uvicorn
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-print("✅ Environment variables loaded from .env")
-
-# Initialize auth manager
-from auth_manager import get_auth_manager
-auth_manager = get_auth_manager()
-print("✅ Auth manager initialized")
-
-# Check for required environment variables
-required_vars = ['CLIENT_ID', 'CLIENT_SECRET', 'REDIRECT_URI']
-missing_vars = [var for var in required_vars if not os.getenv(var)]
-if missing_vars:
-    print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
-    print("Please create a .env file based on .env-template with your credentials")
-    sys.exit(1)
-
-# Start FastAPI server
-if __name__ == "__main__":
+
+
+def main():
+    # Load environment variables
+    import envs
+    print("✅ Environment variables loaded from .env")
+
+    # Initialize auth manager
+    from auth_manager import get_auth_manager
+    get_auth_manager()
+    print("✅ Auth manager initialized")
+
+    # Check for required environment variables
+    required_vars = ['CLIENT_ID', 'CLIENT_SECRET', 'REDIRECT_URI']
+    missing_vars = [var for var in required_vars if not getattr(envs, var)]
+    if missing_vars:
+        print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+        print("Please create a .env file based on .env-template with your credentials")
+        sys.exit(1)
+
+    # Start FastAPI server
     print("🚀 Starting GoTo API Gateway (FastAPI) on http://0.0.0.0:6655")
-    uvicorn.run("app:app", host="0.0.0.0", port=6655, reload=True)
\ No newline at end of file
+    uvicorn.run("app:app", host="0.0.0.0", port=6655, reload=True)
+
+
+# The reloader re-imports this module in each spawned worker; keep env
+# parsing and auth manager setup out of import so only the supervisor runs it
+# (app.py loads .env itself through envs)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Helpers shared by the Redis seeding and migration tools"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+
+import redis
+
+from dotenv import dotenv_values
+
+
+@lru_cache(maxsize=8)
+def _load_env(path: str, mtime_ns: int) -> Dict[str, Optional[str]]:
+    return dict(dotenv_values(path))
+
+
+def load_env(path: str = '.env') -> Dict[str, Optional[str]]:
+    """
+    Parse a .env file, reusing the previous result while the file is unchanged.
+    
+    Args:
+        path: Path to the .env file
+    
+    Returns:
+        Dict of variables (a fresh copy callers may modify), empty if the file is missing
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return dict(_load_env(os.path.abspath(path), mtime_ns))
+
+
+RULE = "=" * 60
+
+PROVIDER = 'goto'
+DEFAULT_ACCOUNT_KEY = '4266846632996939781'
+
+# Expiry for tokens whose real exp is unknown: one hour from when the tool started
+DEFAULT_EXPIRY = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+# Provider fields that don't depend on the credentials being seeded
+PROVIDER_DEFAULTS = MappingProxyType({
+    'status': 'active',
+    'auth_type': 'oauth',
+    'scopes': ('voice-admin', 'admin', 'identity:scim.org'),
+    'api_base_url': 'https://api.jive.com/voice-admin/v1',
+    'features_enabled': ('call-queues', 'auto-attendants', 'extensions'),
+})
+
+
+def build_provider_config(
+    client_id: str,
+    client_secret: str,
+    access_token: str,
+    refresh_token: str,
+    expires_at: str,
+    account_key: str = DEFAULT_ACCOUNT_KEY
+) -> Dict[str, Any]:
+    """Provider hash contents for the GoTo provider"""
+    config = dict(PROVIDER_DEFAULTS)
+    config['scopes'] = list(config['scopes'])
+    config['features_enabled'] = list(config['features_enabled'])
+    config.update(
+        client_id=client_id,
+        client_secret=client_secret,
+        account_key=account_key,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_expiry=expires_at,
+    )
+    return config
+
+
+@dataclass
+class SeedPlan:
+    """Everything to write for one tenant/app; sections left as None are skipped"""
+    tenant: str
+    app: str
+    tenant_config: Optional[Dict[str, Any]] = None
+    system_config: Optional[Dict[str, Any]] = None
+    provider_config: Optional[Dict[str, Any]] = None
+
+
+def apply_plan(pm, plan: SeedPlan, transaction: bool = False) -> Dict[str, bool]:
+    """
+    Queue every write in plan through ProviderManager and send them in one pipeline.
+    
+    An existing provider only gets its tokens updated; the add-vs-update
+    choice needs an answer before anything is queued.
+    
+    Returns:
+        Dict mapping each section queued ('tenant', 'system', 'provider') to
+        whether all of its commands succeeded
+    
+    Raises:
+        redis.RedisError: If Redis can't be reached
+    """
+    pipe = pm.pipeline(transaction=transaction)
+    # (section, index of its first command, index past its last command)
+    sections = []
+    
+    if plan.tenant_config is not None:
+        start = len(pipe)
+        pm.set_tenant_config(plan.tenant, plan.tenant_config, pipe=pipe)
+        sections.append(('tenant', start, len(pipe)))
+    
+    if plan.system_config is not None:
+        start = len(pipe)
+        pm.add_system_credentials(plan.tenant, plan.app, plan.system_config, pipe=pipe)
+        sections.append(('system', start, len(pipe)))
+    
+    provider = plan.provider_config
+    if provider is not None:
+        start = len(pipe)
+        if pm.redis_client.exists(pm.get_provider_key(plan.tenant, PROVIDER)):
+            print(f"⚠️  Provider '{PROVIDER}' already exists for tenant={plan.tenant} - updating tokens")
+            pm.update_tokens(
+                plan.tenant,
+                PROVIDER,
+                provider['access_token'],
+                provider['refresh_token'],
+                provider['token_expiry'],
+                pipe=pipe
+            )
+        else:
+            pm.add_provider(plan.tenant, PROVIDER, provider, pipe=pipe)
+        sections.append(('provider', start, len(pipe)))
+    
+    results = pipe.execute(raise_on_error=False)
+    return {
+        name: not any(isinstance(r, redis.RedisError) for r in results[start:end])
+        for name, start, end in sections
+    }
@@ -2,15 +2,30 @@
 """JWT token utility functions for extracting claims without verification"""
 
 import base64
-import json
-from datetime import datetime
+import copy
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
 
 def decode_jwt_payload(token: str) -> Optional[Dict[str, Any]]:
     """
     Decode JWT payload without signature verification.
     
+    Each call returns a fresh dict the caller owns; memoization lives in
+    parse_jwt, which decodes a given token only once.
+    
     Args:
         token: JWT token string (can be with or without 'Bearer ' prefix)
     
@@ -23,52 +38,99 @@ def decode_jwt_payload(token: str) -> Optional[Dict[str, Any]]:
         
         token = token.strip("'\"")
         
-        parts = token.split('.')
+        parts = token.encode('ascii').split(b'.')
         if len(parts) != 3:
             return None
         
         payload = parts[1]
+        decoded_bytes = base64.urlsafe_b64decode(payload + b'=' * (-len(payload) % 4))
         
-        padding = len(payload) % 4
-        if padding:
-            payload += '=' * (4 - padding)
-        
-        decoded_bytes = base64.urlsafe_b64decode(payload)
-        
-        payload_dict = json.loads(decoded_bytes)
-        
-        return payload_dict
+        return _loads(decoded_bytes)
     
-    except Exception as e:
-        print(f"⚠️  Failed to decode JWT: {e}")
+    except Exception:
+        logger.debug("Failed to decode JWT", exc_info=True)
         return None
 
 
-def get_token_expiry(token: str) -> Optional[str]:
+@lru_cache(maxsize=1024)
+def _format_timestamp(timestamp: Optional[float], label: str) -> Optional[str]:
+    if not timestamp:
+        return None
+    
+    try:
+        return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+    except Exception:
+        logger.debug("Failed to parse %s timestamp", label, exc_info=True)
+        return None
+
+
+@dataclass(slots=True, frozen=True)
+class JwtClaims:
+    """The subset of JWT claims the gateway tooling reads, parsed once per token."""
+    exp_ts: Optional[float]
+    iat_ts: Optional[float]
+    sub: Optional[str]
+    aud: Any
+    sc: str
+    typ: Optional[str]
+    loa: Any
+    
+    @property
+    def expires_at(self) -> Optional[str]:
+        return _format_timestamp(self.exp_ts, "expiry")
+    
+    @property
+    def issued_at(self) -> Optional[str]:
+        return _format_timestamp(self.iat_ts, "issued-at")
+    
+    @property
+    def is_expired(self) -> Optional[bool]:
+        if not self.exp_ts:
+            return None
+        return time.time() >= self.exp_ts
+
+
+@lru_cache(maxsize=1024)
+def parse_jwt(token: str) -> Optional[JwtClaims]:
     """
-    Extract expiry timestamp from JWT token.
+    Parse the claims of a JWT into a JwtClaims record.
     
     Args:
-        token: JWT token string
+        token: JWT token string (can be with or without 'Bearer ' prefix)
     
     Returns:
-        ISO 8601 timestamp string with 'Z' suffix, or None if extraction fails
+        JwtClaims, or None if the token cannot be decoded
     """
     payload = decode_jwt_payload(token)
     
     if not payload:
         return None
     
-    exp_timestamp = payload.get('exp')
-    if not exp_timestamp:
-        return None
+    exp = payload.get('exp')
+    iat = payload.get('iat')
+    return JwtClaims(
+        exp_ts=float(exp) if isinstance(exp, (int, float)) else None,
+        iat_ts=float(iat) if isinstance(iat, (int, float)) else None,
+        sub=payload.get('sub'),
+        aud=payload.get('aud'),
+        sc=payload.get('sc', ''),
+        typ=payload.get('typ'),
+        loa=payload.get('levelOfAssurance'),
+    )
+
+
+def get_token_expiry(token: str) -> Optional[str]:
+    """
+    Extract expiry timestamp from JWT token.
     
-    try:
-        exp_datetime = datetime.utcfromtimestamp(exp_timestamp)
-        return exp_datetime.isoformat() + 'Z'
-    except Exception as e:
-        print(f"⚠️  Failed to parse expiry timestamp: {e}")
-        return None
+    Args:
+        token: JWT token string
+    
+    Returns:
+        ISO 8601 timestamp string with 'Z' suffix, or None if extraction fails
+    """
+    claims = parse_jwt(token)
+    return claims.expires_at if claims else None
 
 
 def get_token_issued_at(token: str) -> Optional[str]:
@@ -81,21 +143,8 @@ def get_token_issued_at(token: str) -> Optional[str]:
     Returns:
         ISO 8601 timestamp string with 'Z' suffix, or None if extraction fails
     """
-    payload = decode_jwt_payload(token)
-    
-    if not payload:
-        return None
-    
-    iat_timestamp = payload.get('iat')
-    if not iat_timestamp:
-        return None
-    
-    try:
-        iat_datetime = datetime.utcfromtimestamp(iat_timestamp)
-        return iat_datetime.isoformat() + 'Z'
-    except Exception as e:
-        print(f"⚠️  Failed to parse issued-at timestamp: {e}")
-        return None
+    claims = parse_jwt(token)
+    return claims.issued_at if claims else None
 
 
 def is_token_expired(token: str) -> Optional[bool]:
@@ -108,21 +157,8 @@ def is_token_expired(token: str) -> Optional[bool]:
     Returns:
         True if expired, False if valid, None if cannot determine
     """
-    payload = decode_jwt_payload(token)
-    
-    if not payload:
-        return None
-    
-    exp_timestamp = payload.get('exp')
-    if not exp_timestamp:
-        return None
-    
-    try:
-        exp_datetime = datetime.utcfromtimestamp(exp_timestamp)
-        now = datetime.utcnow()
-        return now >= exp_datetime
-    except Exception:
-        return None
+    claims = parse_jwt(token)
+    return claims.is_expired if claims else None
 
 
 def get_token_info(token: str) -> Dict[str, Any]:
@@ -135,20 +171,22 @@ def get_token_info(token: str) -> Dict[str, Any]:
     Returns:
         Dict with token information (exp, iat, sub, scopes, etc.)
     """
-    payload = decode_jwt_payload(token)
+    claims = parse_jwt(token)
     
-    if not payload:
+    if not claims:
         return {"error": "Failed to decode token"}
     
+    # aud and levelOfAssurance may be lists held by the cached JwtClaims;
+    # hand the caller its own copies
     info = {
-        "subject": payload.get('sub'),
-        "audience": payload.get('aud'),
-        "scopes": payload.get('sc', ''),
-        "issued_at": get_token_issued_at(token),
-        "expires_at": get_token_expiry(token),
-        "is_expired": is_token_expired(token),
-        "token_type": payload.get('typ'),
-        "level_of_assurance": payload.get('levelOfAssurance')
+        "subject": claims.sub,
+        "audience": copy.deepcopy(claims.aud),
+        "scopes": claims.sc,
+        "issued_at": claims.issued_at,
+        "expires_at": claims.expires_at,
+        "is_expired": claims.is_expired,
+        "token_type": claims.typ,
+        "level_of_assurance": copy.deepcopy(claims.loa)
     }
     
     return info
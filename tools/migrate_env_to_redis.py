@@ -15,10 +15,25 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from provider_manager import get_provider_manager
-from datetime import datetime, timedelta
-from dotenv import dotenv_values
 import argparse
 from jwt_utils import get_token_expiry, is_token_expired
+from _seed_common import DEFAULT_ACCOUNT_KEY, DEFAULT_EXPIRY, RULE, SeedPlan, apply_plan, build_provider_config, load_env
+
+
+def _apply(pm, plan):
+    """Write plan as one MULTI/EXEC; False (with the error printed) if any part failed"""
+    try:
+        results = apply_plan(pm, plan, transaction=True)
+    except Exception as e:
+        print(f"❌ Failed to migrate credentials: {e}")
+        print("   Make sure Redis is running: redis-server")
+        return False
+    
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        print(f"❌ Failed to migrate credentials: Redis rejected the {', '.join(failed)} writes")
+        return False
+    return True
 
 
 def migrate_to_redis(pm, tenant, app, env_path='.env'):
@@ -30,7 +45,7 @@ def migrate_to_redis(pm, tenant, app, env_path='.env'):
         print(f"❌ .env file not found at: {env_path}")
         return False
     
-    env_vars = dotenv_values(env_path)
+    env_vars = load_env(env_path)
     
     system_config = {
         'client_id': env_vars.get('CLIENT_ID', ''),
@@ -40,34 +55,38 @@ def migrate_to_redis(pm, tenant, app, env_path='.env'):
         'token_url': 'https://identity.goto.com/oauth/token'
     }
     
-    if not system_config['client_id'] or not system_config['client_secret']:
+    # All writes go out as one MULTI/EXEC so a migration lands all-or-nothing
+    plan = SeedPlan(tenant, app)
+    
+    migrate_system = bool(system_config['client_id'] and system_config['client_secret'])
+    if not migrate_system:
         print("⚠️  CLIENT_ID or CLIENT_SECRET not found in .env")
         print("   Skipping system credentials migration")
     else:
         print("📝 Migrating system credentials...")
-        result = pm.add_system_credentials(tenant, app, system_config)
-        if result:
-            print(f"✅ System credentials migrated")
-        else:
-            print(f"❌ Failed to migrate system credentials")
+        plan.system_config = system_config
     
     access_token = env_vars.get('ACCESS_TOKEN') or env_vars.get('VOICE_ACCESS_TOKEN')
     refresh_token = env_vars.get('REFRESH_TOKEN') or env_vars.get('VOICE_REFRESH_TOKEN')
     
     if not access_token:
+        if migrate_system:
+            if not _apply(pm, plan):
+                return False
+            print(f"✅ System credentials migrated")
         print("\n⚠️  No ACCESS_TOKEN or VOICE_ACCESS_TOKEN found in .env")
         print("   Skipping provider tokens migration")
         return True
     
     print("\n📝 Migrating provider tokens...")
     
-    # Extract real expiry from JWT token
+    # Extract real expiry from JWT token (only worth decoding if it has three segments)
     access_token_clean = access_token.strip("'\"")
-    expires_at = get_token_expiry(access_token_clean)
+    expires_at = get_token_expiry(access_token_clean) if access_token_clean.count('.') == 2 else None
     
     if not expires_at:
         print("⚠️  Could not extract expiry from token, using 1 hour default")
-        expires_at = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
+        expires_at = DEFAULT_EXPIRY
     else:
         # Check if token is already expired
         if is_token_expired(access_token_clean):
@@ -76,35 +95,18 @@ def migrate_to_redis(pm, tenant, app, env_path='.env'):
         else:
             print(f"✅ Token valid until: {expires_at}")
     
-    provider_config = {
-        'status': 'active',
-        'auth_type': 'oauth',
-        'client_id': system_config['client_id'],
-        'client_secret': system_config['client_secret'],
-        'account_key': env_vars.get('ACCOUNT_KEY', '4266846632996939781'),
-        'access_token': access_token,
-        'refresh_token': refresh_token or '',
-        'token_expiry': expires_at,
-        'scopes': ['voice-admin', 'admin', 'identity:scim.org'],
-        'api_base_url': 'https://api.jive.com/voice-admin/v1',
-        'features_enabled': ['call-queues', 'auto-attendants', 'extensions']
-    }
-    
-    existing = pm.get_provider(tenant, 'goto')
-    
-    if existing:
-        print(f"⚠️  Provider 'goto' already exists - updating tokens")
-        result = pm.update_tokens(tenant, 'goto', access_token, refresh_token, expires_at)
-    else:
-        result = pm.add_provider(tenant, 'goto', provider_config)
-    
-    if result:
-        print(f"✅ Provider tokens migrated")
-    else:
-        print(f"❌ Failed to migrate provider tokens")
-        return False
-    
-    tenant_config = {
+    plan.provider_config = build_provider_config(
+        system_config['client_id'],
+        system_config['client_secret'],
+        access_token,
+        refresh_token or '',
+        expires_at,
+        account_key=env_vars.get('ACCOUNT_KEY', DEFAULT_ACCOUNT_KEY)
+    )
+    
+    # Tenant metadata (and its tenants:known index entry) rides in the same
+    # round trip as the credentials rather than costing one of its own
+    plan.tenant_config = {
         'name': f'{tenant.title()} (Migrated)',
         'primary_provider': 'goto',
         'sync_strategy': 'primary',
@@ -112,12 +114,18 @@ def migrate_to_redis(pm, tenant, app, env_path='.env'):
         'timezone': 'UTC'
     }
     
-    pm.set_tenant_config(tenant, tenant_config)
+    if not _apply(pm, plan):
+        return False
     
-    print(f"\n✅ Migration complete!")
-    print(f"\n⚠️  IMPORTANT: .env file has NOT been modified")
-    print(f"   Your credentials remain in .env for backward compatibility")
-    print(f"   The application will now use Redis for session-based auth")
+    lines = ["✅ System credentials migrated"] if migrate_system else []
+    lines += [
+        "✅ Provider tokens migrated",
+        "\n✅ Migration complete!",
+        "\n⚠️  IMPORTANT: .env file has NOT been modified",
+        "   Your credentials remain in .env for backward compatibility",
+        "   The application will now use Redis for session-based auth",
+    ]
+    print("\n".join(lines))
     
     return True
 
@@ -127,26 +135,27 @@ def main():
     parser.add_argument('--tenant', default='cloudwarriors', help='Tenant ID')
     parser.add_argument('--app', default='goto-gw', help='Application ID')
     parser.add_argument('--env', default='.env', help='Path to .env file')
+    parser.add_argument('--verify', action='store_true', help='PING Redis before migrating')
     
     args = parser.parse_args()
     
-    print("=" * 60)
-    print("Environment to Redis Migration Script")
-    print("=" * 60)
+    print("\n".join([RULE, "Environment to Redis Migration Script", RULE]))
     
     pm = get_provider_manager()
     
-    try:
-        pm.redis_client.ping()
-        print("✅ Redis connection successful\n")
-    except Exception as e:
-        print(f"❌ Redis connection failed: {e}")
-        print("   Make sure Redis is running: redis-server")
-        return 1
+    # Connection errors surface on the first real command; PING only on request
+    if args.verify:
+        try:
+            pm.redis_client.ping()
+            print("✅ Redis connection successful\n")
+        except Exception as e:
+            print(f"❌ Redis connection failed: {e}")
+            print("   Make sure Redis is running: redis-server")
+            return 1
     
     success = migrate_to_redis(pm, args.tenant, args.app, args.env)
     
-    print("\n" + "=" * 60)
+    print("\n" + RULE)
     
     return 0 if success else 1
 
@@ -15,14 +15,14 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from provider_manager import get_provider_manager
-from datetime import datetime, timedelta
-from dotenv import dotenv_values
 import argparse
+import redis
 from jwt_utils import get_token_expiry, is_token_expired
+from _seed_common import DEFAULT_EXPIRY, RULE, SeedPlan, apply_plan, build_provider_config, load_env
 
 
-def seed_system_credentials(pm, tenant, app):
-    """Seed system credentials for OAuth client"""
+def build_system_credentials(tenant, app):
+    """System credentials for OAuth client"""
     print(f"🌱 Seeding system credentials: tenant={tenant} app={app}")
     
     system_config = {
@@ -33,26 +33,27 @@ def seed_system_credentials(pm, tenant, app):
         'token_url': 'https://identity.goto.com/oauth/token'
     }
     
-    result = pm.add_system_credentials(tenant, app, system_config)
-    
-    if result:
+    return system_config
+
+
+def report_system_credentials(creds, ok):
+    if ok:
         print(f"✅ System credentials seeded successfully")
-        creds = pm.get_system_credentials(tenant, app)
         print(f"   Client ID: {creds.get('client_id')}")
         print(f"   Redirect URI: {creds.get('redirect_uri')}")
     else:
         print(f"❌ Failed to seed system credentials")
     
-    return result
+    return ok
 
 
-def seed_provider_tokens(pm, tenant, use_real_tokens=False):
-    """Seed GoTo provider tokens"""
+def build_provider_tokens(tenant, use_real_tokens=False):
+    """GoTo provider tokens; None if --use-env-tokens finds no token"""
     print(f"🌱 Seeding provider tokens: tenant={tenant} provider=goto")
     
     if use_real_tokens:
         # Load from .env
-        env_vars = dotenv_values('.env')
+        env_vars = load_env('.env')
         
         access_token = env_vars.get('VOICE_ACCESS_TOKEN', '').strip("'\"")
         refresh_token = env_vars.get('VOICE_REFRESH_TOKEN', '').strip("'\"")
@@ -61,12 +62,12 @@ def seed_provider_tokens(pm, tenant, use_real_tokens=False):
         
         if not access_token:
             print("❌ No VOICE_ACCESS_TOKEN found in .env")
-            return False
+            return None
         
-        # Extract real expiry from JWT
-        expires_at = get_token_expiry(access_token)
+        # Extract real expiry from JWT (only worth decoding if it has three segments)
+        expires_at = get_token_expiry(access_token) if access_token.count('.') == 2 else None
         if not expires_at:
-            expires_at = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
+            expires_at = DEFAULT_EXPIRY
             print("⚠️  Could not extract expiry, using default")
         else:
             if is_token_expired(access_token):
@@ -79,51 +80,25 @@ def seed_provider_tokens(pm, tenant, use_real_tokens=False):
         refresh_token = 'test_refresh_token_ghijkl789012'
         client_id = 'test_client_id_12345'
         client_secret = 'test_client_secret_67890'
-        expires_at = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
-    
-    provider_config = {
-        'status': 'active',
-        'auth_type': 'oauth',
-        'client_id': client_id,
-        'client_secret': client_secret,
-        'account_key': '4266846632996939781',
-        'access_token': access_token,
-        'refresh_token': refresh_token,
-        'token_expiry': expires_at,
-        'scopes': ['voice-admin', 'admin', 'identity:scim.org'],
-        'api_base_url': 'https://api.jive.com/voice-admin/v1',
-        'features_enabled': ['call-queues', 'auto-attendants', 'extensions']
-    }
+        expires_at = DEFAULT_EXPIRY
     
-    existing = pm.get_provider(tenant, 'goto')
-    
-    if existing:
-        print(f"⚠️  Provider 'goto' already exists for tenant={tenant}")
-        print(f"   Updating tokens instead...")
-        result = pm.update_tokens(
-            tenant, 
-            'goto',
-            provider_config['access_token'],
-            provider_config['refresh_token'],
-            expires_at
-        )
-    else:
-        result = pm.add_provider(tenant, 'goto', provider_config)
-    
-    if result:
+    return build_provider_config(client_id, client_secret, access_token, refresh_token, expires_at)
+
+
+def report_provider_tokens(provider, ok):
+    if ok:
         print(f"✅ Provider tokens seeded successfully")
-        provider = pm.get_provider(tenant, 'goto')
         print(f"   Access Token: {provider.get('access_token')[:20]}...")
         print(f"   Account Key: {provider.get('account_key')}")
         print(f"   Token Expiry: {provider.get('token_expiry')}")
     else:
         print(f"❌ Failed to seed provider tokens")
     
-    return result
+    return ok
 
 
-def seed_tenant_config(pm, tenant):
-    """Seed tenant configuration"""
+def build_tenant_config(tenant):
+    """Tenant configuration"""
     print(f"🌱 Seeding tenant config: tenant={tenant}")
     
     tenant_config = {
@@ -134,17 +109,18 @@ def seed_tenant_config(pm, tenant):
         'timezone': 'America/New_York'
     }
     
-    result = pm.set_tenant_config(tenant, tenant_config)
-    
-    if result:
+    return tenant_config
+
+
+def report_tenant_config(config, ok):
+    if ok:
         print(f"✅ Tenant config seeded successfully")
-        config = pm.get_tenant_config(tenant)
         print(f"   Name: {config.get('name')}")
         print(f"   Primary Provider: {config.get('primary_provider')}")
     else:
         print(f"❌ Failed to seed tenant config")
     
-    return result
+    return ok
 
 
 def verify_redis_connection(pm):
@@ -154,53 +130,74 @@ def verify_redis_connection(pm):
         print("✅ Redis connection successful")
         return True
     except Exception as e:
-        print(f"❌ Redis connection failed: {e}")
-        print("   Make sure Redis is running: redis-server")
+        report_redis_error(e)
         return False
 
 
+def report_redis_error(error):
+    print(f"❌ Redis connection failed: {error}")
+    print("   Make sure Redis is running: redis-server")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Seed Redis with test data for session auth')
     parser.add_argument('--tenant', default='cloudwarriors', help='Tenant ID')
     parser.add_argument('--app', default='goto-gw', help='Application ID')
     parser.add_argument('--clean', action='store_true', help='Clean existing data first')
     parser.add_argument('--use-env-tokens', action='store_true', help='Use real tokens from .env instead of fake tokens')
+    parser.add_argument('--verify', action='store_true', help='PING Redis before seeding')
     
     args = parser.parse_args()
     
-    print("=" * 60)
-    print("Redis Seeding Script for GoTo API Gateway")
-    print("=" * 60)
+    print("\n".join([RULE, "Redis Seeding Script for GoTo API Gateway", RULE]))
     
     pm = get_provider_manager()
     
-    if not verify_redis_connection(pm):
+    # Connection errors surface on the first real command; PING only on request
+    if args.verify and not verify_redis_connection(pm):
         return 1
     
-    if args.clean:
-        print(f"\n🧹 Cleaning existing data...")
-        pm.delete_system_credentials(args.tenant, args.app)
-        pm.delete_provider(args.tenant, 'goto')
-        print(f"✅ Cleanup complete\n")
-    
-    print(f"\nSeeding data for tenant={args.tenant} app={args.app}\n")
+    # Every write goes out in one round trip; the reports echo the values we
+    # wrote (per section, if Redis accepted them) rather than reading them back
+    plan = SeedPlan(args.tenant, args.app)
+    try:
+        if args.clean:
+            print(f"\n🧹 Cleaning existing data...")
+            pm.delete_system_credentials(args.tenant, args.app)
+            pm.delete_provider(args.tenant, 'goto')
+            print(f"✅ Cleanup complete\n")
+        
+        print(f"\nSeeding data for tenant={args.tenant} app={args.app}\n")
+        
+        plan.tenant_config = build_tenant_config(args.tenant)
+        plan.system_config = build_system_credentials(args.tenant, args.app)
+        plan.provider_config = build_provider_tokens(args.tenant, args.use_env_tokens)
+        results = apply_plan(pm, plan)
+    except redis.RedisError as e:
+        print()
+        report_redis_error(e)
+        return 1
     
+    print()
     success = True
-    success &= seed_tenant_config(pm, args.tenant)
-    success &= seed_system_credentials(pm, args.tenant, args.app)
-    success &= seed_provider_tokens(pm, args.tenant, args.use_env_tokens)
+    success &= report_tenant_config(plan.tenant_config, results.get('tenant', False))
+    success &= report_system_credentials(plan.system_config, results.get('system', False))
+    success &= report_provider_tokens(plan.provider_config, results.get('provider', False))
     
-    print("\n" + "=" * 60)
+    lines = ["\n" + RULE]
     if success:
-        print("✅ All data seeded successfully!")
-        print("\nNext steps:")
-        print(f"  1. Start the API: ./venv/bin/python app.py")
-        print(f"  2. Test connect: curl -X POST -H 'Content-Type: application/json' \\")
-        print(f"     -d '{{\"tenant\":\"{args.tenant}\",\"app\":\"{args.app}\"}}' \\")
-        print(f"     http://localhost:8078/auth/connect")
+        lines += [
+            "✅ All data seeded successfully!",
+            "\nNext steps:",
+            "  1. Start the API: ./venv/bin/python app.py",
+            "  2. Test connect: curl -X POST -H 'Content-Type: application/json' \\",
+            f"     -d '{{\"tenant\":\"{args.tenant}\",\"app\":\"{args.app}\"}}' \\",
+            "     http://localhost:8078/auth/connect",
+        ]
     else:
-        print("❌ Some operations failed. Check errors above.")
-    print("=" * 60)
+        lines.append("❌ Some operations failed. Check errors above.")
+    lines.append(RULE)
+    print("\n".join(lines))
     
     return 0 if success else 1
 
@@ -12,9 +12,11 @@ Prerequisites:
     - API server running on localhost:8078
 """
 
-import requests
+import asyncio
+import contextvars
+import httpx
 import time
-import json
+import orjson
 import sys
 import argparse
 
@@ -31,229 +33,309 @@ class Colors:
     END = '\033[0m'
 
 
+# Don't write escape codes into redirected output/log files
+if not sys.stdout.isatty():
+    Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.END = ''
+
+TEST_PREFIX = f"\n{Colors.BLUE}▶ Testing: "
+PASS_PREFIX = f"  {Colors.GREEN}✓ "
+FAIL_PREFIX = f"  {Colors.RED}✗ "
+INFO_PREFIX = f"  {Colors.YELLOW}ℹ "
+END = Colors.END
+RULE = "=" * 60
+
+
+# Lines of the test running in the current task; concurrent tests print their
+# report as one block when they finish instead of interleaving
+_test_output = contextvars.ContextVar('test_output', default=None)
+
+
+def _emit(line):
+    lines = _test_output.get()
+    if lines is None:
+        print(line)
+    else:
+        lines.append(line)
+
+
+async def run_buffered(test_func):
+    lines = []
+    _test_output.set(lines)
+    try:
+        return await test_func()
+    finally:
+        _test_output.set(None)
+        print("\n".join(lines))
+
+
 def print_test(name):
-    print(f"\n{Colors.BLUE}▶ Testing: {name}{Colors.END}")
+    _emit(f"{TEST_PREFIX}{name}{END}")
 
 
 def print_pass(message):
-    print(f"  {Colors.GREEN}✓ {message}{Colors.END}")
+    _emit(f"{PASS_PREFIX}{message}{END}")
 
 
 def print_fail(message):
-    print(f"  {Colors.RED}✗ {message}{Colors.END}")
+    _emit(f"{FAIL_PREFIX}{message}{END}")
 
 
 def print_info(message):
-    print(f"  {Colors.YELLOW}ℹ {message}{Colors.END}")
+    _emit(f"{INFO_PREFIX}{message}{END}")
 
 
 class SessionTester:
     def __init__(self, base_url=BASE_URL):
         self.base_url = base_url
+        self.http = None
         self.session_id = None
         self.passed = 0
         self.failed = 0
+
+    async def __aenter__(self):
+        # One keep-alive pool for the whole run instead of a new TCP connection per call
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={'Content-Type': 'application/json'},
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.http.aclose()
+
+    def _record(self, ok):
+        if ok:
+            self.passed += 1
+        else:
+            self.failed += 1
     
-    def test_health(self):
+    async def test_health(self):
         print_test("API Health Check")
         try:
-            resp = requests.get(f"{self.base_url}/health")
+            resp = await self.http.get("/health")
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 print_pass(f"API is healthy")
                 print_info(f"Redis: {'✓' if data.get('redis_healthy') else '✗'}")
-                self.passed += 1
+                self._record(True)
                 return True
             else:
                 print_fail(f"Health check failed: {resp.status_code}")
-                self.failed += 1
+                self._record(False)
                 return False
         except Exception as e:
             print_fail(f"Health check error: {e}")
-            self.failed += 1
+            self._record(False)
             return False
     
-    def test_connect(self):
+    async def test_connect(self):
         print_test("Session Creation (POST /auth/connect)")
         try:
             payload = {"tenant": DEFAULT_TENANT, "app": DEFAULT_APP}
-            resp = requests.post(
-                f"{self.base_url}/auth/connect",
-                json=payload,
-                headers={"Content-Type": "application/json"}
+            resp = await self.http.post(
+                "/auth/connect",
+                json=payload
             )
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 self.session_id = data.get('data', {}).get('session_id')
                 
                 print_pass("Session created successfully")
                 print_info(f"Session ID: {self.session_id}")
                 print_info(f"Expires in: {data.get('data', {}).get('expires_in')}s")
                 
-                self.passed += 1
+                self._record(True)
                 return True
             else:
                 print_fail(f"Connect failed: {resp.status_code}")
                 print_info(f"Response: {resp.text}")
-                self.failed += 1
+                self._record(False)
                 return False
                 
         except Exception as e:
             print_fail(f"Connect error: {e}")
-            self.failed += 1
+            self._record(False)
             return False
     
-    def test_status_with_session(self):
+    async def test_status_with_session(self):
         print_test("Session Validation (GET /auth/status with session_id)")
         
         if not self.session_id:
             print_fail("No session_id available")
-            self.failed += 1
+            self._record(False)
             return False
         
         try:
-            resp = requests.get(
-                f"{self.base_url}/auth/status",
+            resp = await self.http.get(
+                "/auth/status",
                 params={"session_id": self.session_id}
             )
             
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 
                 print_pass("Session validated successfully")
                 print_info(f"Tenant: {data.get('data', {}).get('tenant')}")
                 print_info(f"App: {data.get('data', {}).get('app')}")
                 
-                self.passed += 1
+                self._record(True)
                 return True
             else:
                 print_fail(f"Status check failed: {resp.status_code}")
-                self.failed += 1
+                self._record(False)
                 return False
                 
         except Exception as e:
             print_fail(f"Status check error: {e}")
-            self.failed += 1
+            self._record(False)
             return False
     
-    def test_status_without_session(self):
+    async def test_status_without_session(self):
         print_test("Legacy Status Check (GET /auth/status)")
         try:
-            resp = requests.get(f"{self.base_url}/auth/status")
+            resp = await self.http.get("/auth/status")
             
             if resp.status_code == 200:
                 print_pass("Legacy status check works")
-                self.passed += 1
+                self._record(True)
                 return True
             else:
                 print_fail(f"Status check failed: {resp.status_code}")
-                self.failed += 1
+                self._record(False)
                 return False
                 
         except Exception as e:
             print_fail(f"Status check error: {e}")
-            self.failed += 1
+            self._record(False)
             return False
     
-    def test_invalid_session(self):
+    async def test_invalid_session(self):
         print_test("Invalid Session Validation")
         try:
             fake_session = "00000000-0000-0000-0000-000000000000"
-            resp = requests.get(
-                f"{self.base_url}/auth/status",
+            resp = await self.http.get(
+                "/auth/status",
                 params={"session_id": fake_session}
             )
             
             if resp.status_code == 401:
                 print_pass("Invalid session correctly rejected (401)")
-                self.passed += 1
+                self._record(True)
                 return True
             else:
                 print_fail(f"Expected 401, got {resp.status_code}")
-                self.failed += 1
+                self._record(False)
                 return False
                 
         except Exception as e:
             print_fail(f"Invalid session test error: {e}")
-            self.failed += 1
+            self._record(False)
             return False
     
-    def test_disconnect(self):
+    async def test_disconnect(self):
         print_test("Session Deletion (POST /auth/disconnect)")
         
         if not self.session_id:
             print_fail("No session_id available")
-            self.failed += 1
+            self._record(False)
             return False
         
         try:
-            resp = requests.post(
-                f"{self.base_url}/auth/disconnect",
+            resp = await self.http.post(
+                "/auth/disconnect",
                 params={"session_id": self.session_id}
             )
             
             if resp.status_code == 200:
                 print_pass("Session disconnected successfully")
                 
-                verify_resp = requests.get(
-                    f"{self.base_url}/auth/status",
+                verify_resp = await self.http.get(
+                    "/auth/status",
                     params={"session_id": self.session_id}
                 )
                 
                 if verify_resp.status_code == 401:
                     print_pass("Session confirmed deleted")
-                    self.passed += 1
+                    self._record(True)
                     return True
                 else:
                     print_fail(f"Session still exists")
-                    self.failed += 1
+                    self._record(False)
                     return False
             else:
                 print_fail(f"Disconnect failed: {resp.status_code}")
-                self.failed += 1
+                self._record(False)
                 return False
                 
         except Exception as e:
             print_fail(f"Disconnect error: {e}")
-            self.failed += 1
+            self._record(False)
             return False
     
-    def test_connect_missing_credentials(self):
+    async def test_connect_missing_credentials(self):
         print_test("Connect with Missing Credentials")
         try:
             payload = {"tenant": "nonexistent", "app": "fake-app"}
-            resp = requests.post(f"{self.base_url}/auth/connect", json=payload)
+            resp = await self.http.post("/auth/connect", json=payload)
             
             if resp.status_code == 404:
                 print_pass("Missing credentials correctly rejected (404)")
-                self.passed += 1
+                self._record(True)
                 return True
             else:
                 print_fail(f"Expected 404, got {resp.status_code}")
-                self.failed += 1
+                self._record(False)
                 return False
                 
         except Exception as e:
             print_fail(f"Missing credentials test error: {e}")
-            self.failed += 1
+            self._record(False)
             return False
     
     def print_summary(self):
-        print("\n" + "=" * 60)
-        print("Test Summary")
-        print("=" * 60)
         total = self.passed + self.failed
-        print(f"Total Tests: {total}")
-        print(f"{Colors.GREEN}Passed: {self.passed}{Colors.END}")
-        print(f"{Colors.RED}Failed: {self.failed}{Colors.END}")
-        
         if self.failed == 0:
-            print(f"\n{Colors.GREEN}✓ All tests passed!{Colors.END}")
+            verdict = f"\n{Colors.GREEN}✓ All tests passed!{Colors.END}"
         else:
-            print(f"\n{Colors.RED}✗ {self.failed} test(s) failed{Colors.END}")
+            verdict = f"\n{Colors.RED}✗ {self.failed} test(s) failed{Colors.END}"
         
-        print("=" * 60)
+        print("\n".join([
+            "\n" + RULE,
+            "Test Summary",
+            RULE,
+            f"Total Tests: {total}",
+            f"{Colors.GREEN}Passed: {self.passed}{Colors.END}",
+            f"{Colors.RED}Failed: {self.failed}{Colors.END}",
+            verdict,
+            RULE,
+        ]))
+
+
+async def run_tests():
+    async with SessionTester() as tester:
+        if not await tester.test_health():
+            print_fail("API is not healthy. Make sure server is running.")
+            return 1
+        
+        async def session_lifecycle():
+            await run_buffered(tester.test_connect)
+            await run_buffered(tester.test_status_with_session)
+            await run_buffered(tester.test_disconnect)
+        
+        # These don't touch the session created by test_connect, so they can
+        # overlap with the lifecycle tests; each test's lines print together
+        await asyncio.gather(
+            run_buffered(tester.test_status_without_session),
+            run_buffered(tester.test_invalid_session),
+            run_buffered(tester.test_connect_missing_credentials),
+            session_lifecycle(),
+        )
+        
+        tester.print_summary()
+        
+        return 0 if tester.failed == 0 else 1
 
 
 def main():
@@ -262,31 +344,9 @@ def main():
     parser.add_argument('--cleanup', action='store_true', help='Clean up test sessions')
     args = parser.parse_args()
     
-    print("=" * 60)
-    print("GoTo API Gateway - Session Tests")
-    print("=" * 60)
-    
-    tester = SessionTester()
-    
-    if not tester.test_health():
-        print_fail("API is not healthy. Make sure server is running.")
-        return 1
-    
-    tests = [
-        tester.test_status_without_session,
-        tester.test_connect,
-        tester.test_status_with_session,
-        tester.test_invalid_session,
-        tester.test_disconnect,
-        tester.test_connect_missing_credentials,
-    ]
-    
-    for test_func in tests:
-        test_func()
-    
-    tester.print_summary()
+    print("\n".join([RULE, "GoTo API Gateway - Session Tests", RULE]))
     
-    return 0 if tester.failed == 0 else 1
+    return asyncio.run(run_tests())
 
 
 if __name__ == '__main__':
@@ -2,21 +2,43 @@
 """Verify OpenAPI spec contains all required session endpoints"""
 
 import requests
-import json
+import orjson
 import sys
+from pathlib import Path
+
+# Conditional-GET cache so unchanged specs come back as an empty 304
+ETAG_PATH = Path('.openapi.etag')
+SPEC_CACHE_PATH = Path('.openapi.cache.json')
+
+
+def fetch_spec(url):
+    headers = {}
+    if ETAG_PATH.exists() and SPEC_CACHE_PATH.exists():
+        headers['If-None-Match'] = ETAG_PATH.read_text().strip()
+    
+    resp = requests.get(url, headers=headers)
+    if resp.status_code == 304:
+        return orjson.loads(SPEC_CACHE_PATH.read_bytes()), True
+    resp.raise_for_status()
+    
+    spec = orjson.loads(resp.content)
+    etag = resp.headers.get('ETag')
+    if etag:
+        SPEC_CACHE_PATH.write_bytes(resp.content)
+        ETAG_PATH.write_text(etag)
+    return spec, False
 
 
 def verify_openapi():
     print("🔍 Fetching OpenAPI spec from http://localhost:8078/openapi.json...")
     
     try:
-        resp = requests.get("http://localhost:8078/openapi.json")
-        spec = resp.json()
+        spec, cached = fetch_spec("http://localhost:8078/openapi.json")
     except Exception as e:
         print(f"❌ Failed to fetch OpenAPI: {e}")
         return False
     
-    print("✅ OpenAPI spec retrieved\n")
+    print("✅ OpenAPI spec unchanged, using cached copy\n" if cached else "✅ OpenAPI spec retrieved\n")
     
     required_endpoints = [
         ("/auth/connect", "post"),
@@ -29,25 +51,17 @@ def verify_openapi():
     
     paths = spec.get("paths", {})
     
-    print("📋 Checking required endpoints...")
-    all_found = True
-    
-    for endpoint, method in required_endpoints:
-        found = False
-        for path_key in paths:
-            if path_key in [endpoint, endpoint.replace(":path", "")]:
-                if method in paths[path_key]:
-                    print(f"  ✓ {method.upper()} {endpoint}")
-                    found = True
-                    break
-        
-        if not found:
-            print(f"  ✗ {method.upper()} {endpoint} - MISSING")
-            all_found = False
+    # FastAPI publishes "{api_path:path}" routes as "{api_path}"
+    missing_endpoints = {
+        (ep, m) for ep, m in required_endpoints
+        if m not in paths.get(ep, paths.get(ep.replace(":path", ""), {}))
+    }
     
-    print()
+    print("\n".join(["📋 Checking required endpoints..."] + [
+        f"  ✗ {m.upper()} {ep} - MISSING" if (ep, m) in missing_endpoints else f"  ✓ {m.upper()} {ep}"
+        for ep, m in required_endpoints
+    ]) + "\n")
     
-    print("📋 Checking required schemas...")
     required_schemas = [
         "ConnectRequest",
         "ConnectResponse",
@@ -58,14 +72,13 @@ def verify_openapi():
     components = spec.get("components", {})
     schemas = components.get("schemas", {})
     
-    for schema in required_schemas:
-        if schema in schemas:
-            print(f"  ✓ {schema}")
-        else:
-            print(f"  ✗ {schema} - MISSING")
-            all_found = False
+    missing_schemas = set(required_schemas) - schemas.keys()
+    print("\n".join(["📋 Checking required schemas..."] + [
+        f"  ✗ {schema} - MISSING" if schema in missing_schemas else f"  ✓ {schema}"
+        for schema in required_schemas
+    ]) + "\n")
     
-    print()
+    all_found = not missing_endpoints and not missing_schemas
     
     if all_found:
         print("✅ All required endpoints and schemas present!")